@@ -0,0 +1,248 @@
+import bisect
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from usage_log import FEEDBACK_FILE, WAL_FILE
+
+ROLLUP_FILE = "analytics_rollup.json"
+ROLLUP_FORMAT_VERSION = 2
+FILTER_LOG = "filter_log.csv"
+# Usage logs in the LOG_FIELDS layout: the older filter_log.csv and the WAL
+# every download is written to before it is sent to the sheet
+USAGE_SOURCES = [FILTER_LOG, WAL_FILE]
+FEEDBACK_SOURCES = [FEEDBACK_FILE]
+NONE_OPTION = "-- None --"
+COMBO_COLUMNS = ['selected_field', 'selected_campus', 'selected_mode']
+COMBO_SEPARATOR = " | "
+# Upper bounds of the result-count histogram; larger counts go in a last bucket
+RESULT_BUCKETS = [0, 1, 5, 10, 25, 50, 100, 250, 500]
+RATINGS = ['1', '2', '3', '4', '5']
+
+_lock = threading.Lock()
+
+
+def empty_rollup():
+    # 'sources' holds each log's own day totals, so a log that is replaced can
+    # be recounted on its own; 'days' is their sum, which the views read
+    return {'format': ROLLUP_FORMAT_VERSION, 'updated_at': None, 'watermarks': {}, 'sources': {}, 'days': {}}
+
+
+def empty_day():
+    return {
+        'downloads': 0,
+        'zero_results': 0,
+        'results': [0] * (len(RESULT_BUCKETS) + 1),
+        'combos': {},
+        'feedback': 0,
+        'comments': 0,
+        'ratings': {rating: 0 for rating in RATINGS},
+    }
+
+
+def bucket_labels():
+    labels, low = [], 0
+    for high in RESULT_BUCKETS:
+        labels.append(str(high) if high == low else f"{low}-{high}")
+        low = high + 1
+    return labels + [f"{low}+"]
+
+
+def load_rollup(path=ROLLUP_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            rollup = json.load(f)
+    except FileNotFoundError:
+        return empty_rollup()
+    except (OSError, ValueError) as e:
+        print(f"Analytics rollup unreadable, starting over: {e}")
+        return empty_rollup()
+    if rollup.get('format') != ROLLUP_FORMAT_VERSION:
+        return empty_rollup()
+    return rollup
+
+
+def save_rollup(rollup, path=ROLLUP_FILE):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rollup, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def read_new_rows(path, watermark):
+    # Rows appended to a CSV log since the watermark ({'offset': bytes read,
+    # 'fields': header}), as dicts, plus the new watermark. Only complete
+    # lines are taken. Callers check for a file shorter than the offset
+    # (replaced or rotated) before calling; see run_rollup.
+    watermark = dict(watermark or {})
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return [], watermark
+    offset = watermark.get('offset', 0)
+    if size == offset:
+        return [], watermark
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+    end = data.rfind(b"\n") + 1
+    if not end:
+        return [], watermark
+
+    reader = csv.reader(io.StringIO(data[:end].decode("utf-8"), newline=""))
+    fields = next(reader) if offset == 0 else watermark.get('fields')
+    rows = [dict(zip(fields, row)) for row in reader if row]
+    return rows, {'offset': offset + end, 'fields': fields}
+
+
+def add_usage(days, row):
+    day = days.setdefault(row.get('timestamp', '')[:10] or 'unknown', empty_day())
+    day['downloads'] += 1
+    combo = COMBO_SEPARATOR.join(row.get(column) or NONE_OPTION for column in COMBO_COLUMNS)
+    day['combos'][combo] = day['combos'].get(combo, 0) + 1
+    try:
+        num_results = int(float(row.get('num_results', '')))
+    except ValueError:
+        return
+    day['results'][bisect.bisect_left(RESULT_BUCKETS, num_results)] += 1
+    if num_results == 0:
+        day['zero_results'] += 1
+
+
+def add_feedback(days, row):
+    day = days.setdefault(row.get('timestamp', '')[:10] or 'unknown', empty_day())
+    day['feedback'] += 1
+    if (row.get('feedback') or '').strip():
+        day['comments'] += 1
+    rating = row.get('rating', '')
+    if rating in day['ratings']:
+        day['ratings'][rating] += 1
+
+
+def _shrunk(path, watermark):
+    try:
+        return os.path.getsize(path) < watermark.get('offset', 0)
+    except OSError:
+        return False
+
+
+def merge_days(sources):
+    # Sum of several sources' {day: totals}
+    merged = {}
+    for days in sources:
+        for day, totals in days.items():
+            into = merged.setdefault(day, empty_day())
+            for key in ('downloads', 'zero_results', 'feedback', 'comments'):
+                into[key] += totals[key]
+            into['results'] = [a + b for a, b in zip(into['results'], totals['results'])]
+            for counts, name in ((into['combos'], 'combos'), (into['ratings'], 'ratings')):
+                for value, count in totals[name].items():
+                    counts[value] = counts.get(value, 0) + count
+    return merged
+
+
+def run_rollup(path=ROLLUP_FILE, usage_sources=USAGE_SOURCES, feedback_sources=FEEDBACK_SOURCES):
+    # Folds the log rows written since the last run into the rollup and saves
+    # it (temp file + rename) together with the new watermarks. Only one
+    # process should run this against a given rollup file.
+    with _lock:
+        rollup = load_rollup(path)
+        ingested = {'usage_rows': 0, 'feedback_rows': 0}
+        for sources, add, counter in (
+            (usage_sources, add_usage, 'usage_rows'),
+            (feedback_sources, add_feedback, 'feedback_rows'),
+        ):
+            for source in sources:
+                watermark = rollup['watermarks'].get(source)
+                if watermark and _shrunk(source, watermark):
+                    # Replaced or rotated: its old rows can't be told apart from
+                    # new ones, so this log's totals are recounted from scratch
+                    print(f"Analytics: {source} shrank since the last rollup; recounting it")
+                    rollup['sources'].pop(source, None)
+                    watermark = None
+                rows, watermark = read_new_rows(source, watermark)
+                days = rollup['sources'].setdefault(source, {})
+                for row in rows:
+                    add(days, row)
+                rollup['watermarks'][source] = watermark
+                ingested[counter] += len(rows)
+        rollup['days'] = merge_days(rollup['sources'].values())
+        rollup['updated_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        save_rollup(rollup, path)
+        return ingested
+
+
+def start_rollup(interval=300.0, path=ROLLUP_FILE):
+    # Runs the rollup now and then every interval on a daemon thread
+    def run():
+        while True:
+            try:
+                run_rollup(path)
+            except Exception as e:
+                print(f"Analytics rollup failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="analytics-rollup", daemon=True)
+    thread.start()
+    return thread
+
+
+# Views over a loaded rollup, for the dashboard; none of them read the raw logs
+
+def daily_summary(rollup):
+    rows = []
+    for day, totals in sorted(rollup['days'].items()):
+        ratings = totals['ratings']
+        rated = sum(ratings.values())
+        rows.append({
+            'Day': day,
+            'Downloads': totals['downloads'],
+            'No results': totals['zero_results'],
+            'Feedback': totals['feedback'],
+            'Comments': totals['comments'],
+            'Mean rating': round(sum(int(r) * n for r, n in ratings.items()) / rated, 2) if rated else None,
+        })
+    return pd.DataFrame(rows, columns=['Day', 'Downloads', 'No results', 'Feedback', 'Comments', 'Mean rating'])
+
+
+def top_combinations(rollup, limit=20):
+    counts = {}
+    for totals in rollup['days'].values():
+        for combo, count in totals['combos'].items():
+            counts[combo] = counts.get(combo, 0) + count
+    top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return pd.DataFrame(
+        [combo.split(COMBO_SEPARATOR) + [count] for combo, count in top],
+        columns=['Field', 'Campus', 'Mode', 'Downloads'],
+    )
+
+
+def result_distribution(rollup):
+    totals = [0] * (len(RESULT_BUCKETS) + 1)
+    for day in rollup['days'].values():
+        totals = [a + b for a, b in zip(totals, day['results'])]
+    return pd.Series(totals, index=bucket_labels(), name='Downloads')
+
+
+def rating_histogram(rollup):
+    # Day x rating counts, days with feedback only
+    return pd.DataFrame(
+        {day: totals['ratings'] for day, totals in sorted(rollup['days'].items()) if totals['feedback']},
+        index=RATINGS,
+    ).T
+
+
+if __name__ == "__main__":
+    # python analytics.py [ROLLUP_FILE]: fold new log rows into the rollup once
+    rollup_path = sys.argv[1] if len(sys.argv) > 1 else ROLLUP_FILE
+    started = time.perf_counter()
+    ingested = run_rollup(rollup_path)
+    print(f"Rollup {rollup_path}: {ingested['usage_rows']} usage rows, {ingested['feedback_rows']} feedback rows "
+          f"in {time.perf_counter() - started:.3f}s")
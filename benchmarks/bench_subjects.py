@@ -0,0 +1,40 @@
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import SUBJECTS, synthetic_catalog
+from subjects import SubjectIndex, load_vocabulary
+
+SIZES = [10_000, 100_000]
+SELECTIONS = [
+    ([], 80.0),
+    (['English'], None),
+    (['Mathematical Methods', 'Physics'], 90.0),
+    (['Biology', 'Chemistry', 'Mathematical Methods', 'Psychology'], 75.0),
+    (SUBJECTS[:8], None),
+]
+REPEATS = 50
+
+
+def bench(n):
+    df = synthetic_catalog(n)
+    started = time.perf_counter()
+    index = SubjectIndex(df, load_vocabulary(df))
+    build = time.perf_counter() - started
+
+    timings = []
+    for _ in range(REPEATS):
+        for subjects, atar in SELECTIONS:
+            started = time.perf_counter()
+            index.match(subjects, atar)
+            timings.append(time.perf_counter() - started)
+    timings = np.array(timings) * 1e3
+    print(f"{n:>7} degrees  build {build:6.2f}s  "
+          f"match p50 {np.percentile(timings, 50):.3f}ms  p95 {np.percentile(timings, 95):.3f}ms  "
+          f"max {timings.max():.3f}ms")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or SIZES:
+        bench(n)
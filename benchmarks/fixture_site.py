@@ -0,0 +1,51 @@
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic import degree_html, listing_html
+
+
+def _handler(pages, hits, broken):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if hits is not None:
+                hits[self.path] += 1
+            if self.path in {f"/degrees/{i}/" for i in broken}:
+                self.send_error(503)
+                return
+            body = pages.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            body = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@contextmanager
+def fixture_site(catalog, hits=None, broken=()):
+    # Serves one study-area listing and a page per degree on localhost;
+    # yields (listing URL, [(degree name, degree URL), ...]). hits (a
+    # Counter) records requests per path; degree pages whose row positions
+    # are in broken (checked on every request) answer 503.
+    pages = {f"/degrees/{i}/": degree_html(row) for i, (_, row) in enumerate(catalog.iterrows())}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(pages, hits, broken))
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    degree_links = [(name, f"{base_url}/degrees/{i}/") for i, name in enumerate(catalog['Degree Name'])]
+    pages["/study-areas/all/"] = listing_html([(name, url[len(base_url):]) for name, url in degree_links])
+
+    thread = threading.Thread(target=server.serve_forever, name="fixture-site", daemon=True)
+    thread.start()
+    try:
+        yield f"{base_url}/study-areas/all/", degree_links
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,190 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fixture_site import fixture_site
+from benchmarks.synthetic import synthetic_catalog, write_sources
+from catalog import CATALOG_FILE, build_catalog, read_catalog
+from exports import export_bytes, page_frame
+from filter_engine import FilterIndex, sort_rows
+from search_index import SearchIndex
+from uni_functions import HttpFirstFetcher, ba_links, clean_up, data_pivot, get_data
+
+SIZES = [300, 10_000, 100_000]
+REPEATS = 20
+HEAVY_REPEATS = 3  # catalog builds, full-table renders and exports
+SCRAPE_PAGES = 300
+SCRAPE_WORKERS = 4
+FILTER_LOG = "filter_log.csv"
+RESULTS_DIR = os.path.join("benchmarks", "results")
+SORT_COLUMNS = ['Degree Name', 'Guaranteed ATAR score', 'Duration']
+NONE_OPTION = "-- None --"
+# p50 slowdown reported as a regression by --baseline
+REGRESSION_RATIO = 1.2
+
+
+def measure(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings = np.array(timings) * 1e3
+    return {
+        'n': repeats,
+        'min_ms': round(float(timings.min()), 4),
+        'p50_ms': round(float(np.percentile(timings, 50)), 4),
+        'p95_ms': round(float(np.percentile(timings, 95)), 4),
+        'mean_ms': round(float(timings.mean()), 4),
+    }
+
+
+def filter_combinations(path=FILTER_LOG):
+    # Distinct selections from the usage log, plus the unfiltered view
+    combos = {(None, None, None, None, None)}
+    if os.path.exists(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                combos.add(tuple(
+                    None if row.get(column) in (None, "", NONE_OPTION) else row[column]
+                    for column in ['selected_field', 'selected_degree', 'selected_campus',
+                                   'selected_mode', 'selected_start_date']
+                ))
+    return sorted(combos, key=lambda combo: [value or "" for value in combo])
+
+
+def bench_catalog(size, repeats, heavy_repeats):
+    results = []
+    catalog = synthetic_catalog(size)
+
+    with tempfile.TemporaryDirectory() as source_dir:
+        write_sources(catalog, source_dir)
+        path = os.path.join(source_dir, CATALOG_FILE)
+        results.append(('build_catalog', '', measure(lambda: build_catalog(source_dir, path), heavy_repeats)))
+        results.append(('load_data', '', measure(lambda: read_catalog(path), repeats)))
+        df = read_catalog(path)
+
+    results.append(('filter_index_build', '', measure(lambda: FilterIndex(df), heavy_repeats)))
+    results.append(('search_index_build', '', measure(lambda: SearchIndex(df), heavy_repeats)))
+    filter_index = FilterIndex(df)
+    search_index = SearchIndex(df)
+
+    for field, degree, campus, mode, start_date in filter_combinations():
+        def run_filter():
+            if degree:
+                bits = filter_index.mask(field=field, campus=campus, mode=mode, start_date=start_date)
+                return search_index.search(degree, within=bits)
+            return filter_index.query(field=field, campus=campus, mode=mode, start_date=start_date)
+        case = f"field={field} degree={degree} campus={campus} mode={mode} start_date={start_date}"
+        results.append(('filter', case, measure(run_filter, repeats)))
+        selection = dict(field=field, campus=campus, mode=mode, start_date=start_date)
+        results.append(('facet_counts', case, measure(lambda: filter_index.facet_counts(**selection), repeats)))
+
+    for sort_col in SORT_COLUMNS:
+        for ascending in (True, False):
+            results.append(('sort', f"{sort_col} {'asc' if ascending else 'desc'}",
+                            measure(lambda: sort_rows(df, sort_col, ascending), repeats)))
+
+    ordered = df.iloc[sort_rows(df, 'Degree Name', True)]
+    # What the paged view does per page: slice the rows and build the st.dataframe frame
+    page_rows = sort_rows(df, 'Degree Name', True)[:50]
+    results.append(('render_page', 'first 50 rows', measure(lambda: page_frame(df, page_rows), repeats)))
+    for export_format in ['CSV', 'CSV (gzip)']:
+        results.append(('export', export_format, measure(lambda: export_bytes(ordered, export_format), heavy_repeats)))
+    return results
+
+
+def bench_scrape(pages, repeats, workers=SCRAPE_WORKERS):
+    # The HTTP path only; the browser fallback needs Chrome and is not timed
+    results = []
+    catalog = synthetic_catalog(pages, seed=1)
+    with fixture_site(catalog) as (listing_url, _), HttpFirstFetcher(workers) as fetcher:
+        links = ba_links(listing_url, fetcher)
+        results.append(('scrape.listing', '', measure(lambda: ba_links(listing_url, fetcher), repeats)))
+        results.append(('scrape.get_data', f"{workers} workers",
+                        measure(lambda: get_data(links, pool=fetcher, workers=workers), repeats)))
+        raw = get_data(links, pool=fetcher, workers=workers)
+    results.append(('scrape.data_pivot', '', measure(lambda: data_pivot(raw), repeats)))
+    pivoted = data_pivot(raw)
+    results.append(('scrape.clean_up', '', measure(lambda: clean_up(pivoted), repeats)))
+    return results
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return commit.stdout.strip(), bool(dirty.stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(baseline_path, report):
+    # Prints p50 changes against an earlier results file; returns the regressions
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r['name'], r['size'], r['case']): r for r in json.load(f)['results']}
+    regressions = []
+    for result in report['results']:
+        old = baseline.get((result['name'], result['size'], result['case']))
+        if old is None or not old['p50_ms']:
+            continue
+        ratio = result['p50_ms'] / old['p50_ms']
+        flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+        print(f"{result['name']:<20} {result['size']:>7} {result['case'][:50]:<50} "
+              f"{old['p50_ms']:>10.3f} -> {result['p50_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time catalog load, filter, sort, render, export and scrape stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--heavy-repeats", type=int, default=HEAVY_REPEATS)
+    parser.add_argument("--scrape-pages", type=int, default=SCRAPE_PAGES, help="0 skips the scrape benchmarks")
+    parser.add_argument("--output", help="results JSON (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    commit, dirty = git_commit()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': [],
+    }
+
+    def add(size, rows):
+        for name, case, timing in rows:
+            report['results'].append({'name': name, 'size': size, 'case': case, **timing})
+            print(f"{name:<20} {size:>7} {case[:50]:<50} p50 {timing['p50_ms']:>10.3f} ms  p95 {timing['p95_ms']:>10.3f} ms")
+
+    for size in args.sizes:
+        add(size, bench_catalog(size, args.repeats, args.heavy_repeats))
+    if args.scrape_pages:
+        add(args.scrape_pages, bench_scrape(args.scrape_pages, args.heavy_repeats))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        return 1 if compare(args.baseline, report) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
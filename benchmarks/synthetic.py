@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from catalog import ALL_DEGREES_FILE, CLEAN_FIELD_LIST, SUBJECTS_FILE, field_files, typed_catalog
+from uni_functions import DEGREE_MARKER, LISTING_MARKER
+
+CAMPUSES = ['Adelaide City', 'Magill', 'Mawson Lakes', 'Mount Gambier', 'Roseworthy', 'Waite', 'Whyalla']
+MODES = ['100% Online', 'On Campus', '100% Online, On Campus']
+START_DATES = ['February', 'February, July', 'January, April, June, September', 'July']
+DURATIONS = ['1 year(s) full-time', '3 year(s) full-time', '4 year(s) full-time', '5 year(s) full-time']
+SUBJECTS = [
+    'English', 'Mathematical Methods', 'Specialist Mathematics', 'Chemistry', 'Physics', 'Biology',
+    'Psychology', 'Accounting', 'Economics', 'Legal Studies', 'Music Performance', 'Visual Arts',
+    'Digital Technologies', 'Geography', 'Modern History', 'Nutrition', 'Business Innovation',
+]
+DISCIPLINES = [
+    'Accounting', 'Agricultural Sciences', 'Architecture', 'Arts', 'Aviation', 'Biomedical Science',
+    'Business', 'Commerce', 'Computer Science', 'Creative Writing', 'Dental Surgery', 'Economics',
+    'Engineering', 'Environmental Science', 'Finance', 'Health Science', 'Information Technology',
+    'Journalism', 'Laws', 'Marketing', 'Mathematics', 'Medicine', 'Midwifery', 'Music', 'Nursing',
+    'Nutrition', 'Pharmacy', 'Physiotherapy', 'Psychology', 'Social Work', 'Teaching', 'Tourism',
+]
+WORDS = [
+    'Applied', 'Advanced', 'Data', 'Design', 'Digital', 'Global', 'Human', 'Industrial', 'Marine',
+    'Molecular', 'Public', 'Quantum', 'Regional', 'Sports', 'Sustainable', 'Urban', 'Clinical',
+]
+
+
+def _pick(rng, options, size):
+    return np.asarray(options, dtype=object)[rng.integers(0, len(options), size)]
+
+
+def _subject_lists(rng, size, low=0, high=4):
+    counts = rng.integers(low, high + 1, size)
+    return [', '.join(rng.choice(SUBJECTS, count, replace=False)) for count in counts]
+
+
+def synthetic_catalog(n, seed=0):
+    # Typed catalog rows shaped like catalog.load_catalog() output
+    rng = np.random.default_rng(seed)
+    names = [
+        f"Bachelor of {discipline} majoring in {word} {topic} {i}"
+        for i, (discipline, word, topic) in enumerate(zip(
+            _pick(rng, DISCIPLINES, n), _pick(rng, WORDS, n), _pick(rng, DISCIPLINES, n)
+        ))
+    ]
+    field_lists = [list(rng.choice(CLEAN_FIELD_LIST, count, replace=False)) for count in rng.integers(1, 3, n)]
+    campus_lists = [sorted(rng.choice(CAMPUSES, count, replace=False)) for count in rng.integers(0, 4, n)]
+    atar = np.round(rng.uniform(50, 99.95, n), 2).astype(str)
+    atar[rng.random(n) < 0.2] = ''
+
+    return typed_catalog(pd.DataFrame({
+        'Degree Name': names,
+        'Field': [' ; '.join(sorted(fields)) for fields in field_lists],
+        'Mode': _pick(rng, MODES, n),
+        'Campus': [', '.join(campuses) for campuses in campus_lists],
+        'Start date': _pick(rng, START_DATES, n),
+        'Guaranteed ATAR score': atar,
+        'Duration': _pick(rng, DURATIONS, n),
+        'Assumed knowledge': [f"SACE Stage 2 {s} (or equivalent)" if s else '' for s in _subject_lists(rng, n, 0, 2)],
+        'Prerequisite': [f"SACE Stage 2 {s} (or equivalent)" if s else '' for s in _subject_lists(rng, n, 0, 2)],
+        'Recommended Stage 2 Subjects': _subject_lists(rng, n, 1, 4),
+        'Degree URL': [f"https://example.edu.au/study/degrees/degree-{i}/dom/" for i in range(n)],
+    }))
+
+
+def source_frames(catalog):
+    # Raw scrape outputs that aggregate back into `catalog`: the merged
+    # AU_all_degrees CSV, the Stage 2 subjects CSV and one frame per field file
+    degrees = pd.DataFrame({
+        'Degree Name': catalog['Degree Name'],
+        'Guaranteed ATAR score': catalog['Guaranteed ATAR score'],
+        'Prerequisite': catalog['Prerequisite'].astype(str),
+        'Assumed knowledge': catalog['Assumed knowledge'].astype(str),
+        'Mode': catalog['Mode'].astype(str),
+        'Campus': catalog['Campus'].astype(str),
+        'Study as': 'Full time or part time',
+        'Duration': catalog['Duration'].astype(str),
+        'Start date': catalog['Start date'].astype(str),
+        'Degree URL': catalog['Degree URL'],
+    })
+    subjects = catalog[['Degree Name', 'Recommended Stage 2 Subjects']].astype(str)
+    fields = catalog['Field List'].explode()
+    field_frames = {
+        file: degrees.loc[fields.index[fields == field_name].unique()]
+        for file, field_name in field_files.items()
+    }
+    return degrees, subjects, field_frames
+
+
+def write_sources(catalog, output_dir):
+    degrees, subjects, field_frames = source_frames(catalog)
+    degrees.to_csv(os.path.join(output_dir, ALL_DEGREES_FILE), index=False)
+    subjects.to_csv(os.path.join(output_dir, SUBJECTS_FILE), index=False)
+    for file, frame in field_frames.items():
+        frame.to_csv(os.path.join(output_dir, file), index=False)
+
+
+def listing_html(degree_links):
+    # Study-area page markup as parse_listing() expects it
+    cards = "\n".join(
+        f'<a class="{LISTING_MARKER}" href="{url}"><div class="{LISTING_MARKER}-title">{name}</div></a>'
+        for name, url in degree_links
+    )
+    return f"<html><body>{cards}</body></html>"
+
+
+def degree_html(row):
+    # Degree page markup as parse_degree() expects it: label span first,
+    # value span last ('Entry scores' carries its value second to last)
+    atar = row['Guaranteed ATAR score']
+    items = [
+        ('Entry scores', f'<span>Guaranteed ATAR</span><span>{"" if pd.isna(atar) else atar}</span><span>*</span>'),
+        ('Mode', f"<span>{row['Mode']}</span>"),
+        ('Campus', f"<span>{row['Campus']}</span>"),
+        ('Duration', f"<span>{row['Duration']}</span>"),
+        ('Start date', f"<span>{row['Start date']}</span>"),
+        ('Prerequisite', f"<span>{row['Prerequisite']}</span>"),
+        ('Assumed knowledge', f"<span>{row['Assumed knowledge']}</span>"),
+        ('Program code', "<span>XBCH</span>"),
+    ]
+    blocks = "\n".join(
+        f'<div class="{DEGREE_MARKER}"><span>{label}</span>{value}</div>' for label, value in items
+    )
+    return f"<html><body><h1>{row['Degree Name']}</h1>{blocks}</body></html>"
@@ -0,0 +1,315 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Bump when the shape of the built catalog changes so stale artifacts get rebuilt
+CATALOG_FORMAT_VERSION = 3
+CATALOG_FILE = "AU_degrees_catalog_2026.arrow"
+METADATA_KEY = b"degree_catalog"
+
+ALL_DEGREES_FILE = "AU_all_degrees_2026.csv"
+SUBJECTS_FILE = "AU_Recommended_Stage_2_Subjects.csv"
+
+field_files = {
+        "AU_accounting_commerce_ecconomics_degrees_2026.csv": "Accounting, Commerce & Economics",
+        "AU_agriculture_animal_veterinary-science_degrees_2026.csv": "Agriculture, Animal & Veterinary Science",
+        "AU_allied-health_degrees_2026.csv": "Allied Health",
+        "AU_architecture-design_degrees_2026.csv": "Architecture & Design",
+        "AU_arts_humanities_social-sciences_degrees_2026.csv": "Arts, Humanities & Social Sciences",
+        "AU_aviation_degrees_2026.csv": "Aviation",
+        "AU_business_marketing_management_degrees_2026.csv": "Business, Marketing & Management",
+        "AU_computer-science_information-technology_degrees_2026.csv": "Computer Science & IT",
+        "AU_creative_media_communication_degrees_2026.csv": "Creative, Media & Communication",
+        "AU_engineering_degrees_2026.csv": "Engineering",
+        "AU_health_biomedical-sciences_degrees_2026.csv": "Health & Biomedical Sciences",
+        "AU_law_justice_degrees_2026.csv": "Law & Justice",
+        "AU_mathematics_data-science_degrees_2026.csv": "Mathematics & Data Science",
+        "AU_medicine_dentistry_oral-health_degrees_2026.csv": "Medicine, Dentistry & Oral Health",
+        "AU_music_degrees_2026.csv": "Music",
+        "AU_nursing_midwifery_degrees_2026.csv": "Nursing & Midwifery",
+        "AU_nutrition_food-science_degrees_2026.csv": "Nutrition & Food Science",
+        "AU_property_construction_real-estate_degrees_2026.csv": "Property, Construction & Real Estate",
+        "AU_psychology_social-work_degrees_2026.csv": "Psychology & Social Work",
+        "AU_science_environment_sustainability_degrees_2026.csv": "Science, Environment & Sustainability",
+        "AU_teaching_education_degrees_2026.csv": "Teaching & Education",
+        "AU_tourism_sports_events_degrees_2026.csv": "Tourism, Sport & Events"
+    }
+
+CLEAN_FIELD_LIST = [
+        "Accounting, Commerce & Economics",
+        "Agriculture, Animal & Veterinary Science",
+        "Allied Health",
+        "Architecture & Design",
+        "Arts, Humanities & Social Sciences",
+        "Aviation",
+        "Business, Marketing & Management",
+        "Computer Science & IT",
+        "Creative, Media & Communication",
+        "Engineering",
+        "Health & Biomedical Sciences",
+        "Law & Justice",
+        "Mathematics & Data Science",
+        "Medicine, Dentistry & Oral Health",
+        "Music",
+        "Nursing & Midwifery",
+        "Nutrition & Food Science",
+        "Property, Construction & Real Estate",
+        "Psychology & Social Work",
+        "Science, Environment & Sustainability",
+        "Teaching & Education",
+        "Tourism, Sport & Events"
+    ]
+
+
+
+def make_shard(institution, year, name, field_files, source_dir=".", study_areas=None):
+    # One independently built catalog per institution and intake year. Source
+    # and artifact names follow the AU 2026 layout, e.g. XY_all_degrees_2027.csv.
+    return {
+        'key': f"{institution}-{year}",
+        'institution': institution,
+        'year': year,
+        'name': name,
+        'source_dir': source_dir,
+        'all_degrees_file': f"{institution}_all_degrees_{year}.csv",
+        'subjects_file': f"{institution}_Recommended_Stage_2_Subjects.csv",
+        'field_files': field_files,
+        'catalog_file': os.path.normpath(os.path.join(source_dir, f"{institution}_degrees_catalog_{year}.arrow")),
+        'study_areas': study_areas,
+    }
+
+
+DEFAULT_SHARD = make_shard("AU", 2026, "Adelaide University", field_files)
+
+MULTI_VALUE_COLUMNS = ['Assumed knowledge', 'Prerequisite', 'Recommended Stage 2 Subjects']
+FIRST_VALUE_COLUMNS = ['Start date', 'Guaranteed ATAR score', 'Duration', 'Degree URL']
+
+# Repeated display strings, stored once per distinct value
+CATEGORICAL_COLUMNS = [
+    'Field', 'Mode', 'Campus', 'Start date', 'Duration',
+    'Assumed knowledge', 'Prerequisite', 'Recommended Stage 2 Subjects'
+]
+# Parsed forms of the display columns, used for filtering and sorting only
+DERIVED_COLUMNS = ['Field List', 'Campus List', 'Mode Flags', 'Duration (months)']
+
+MODE_FLAGS = {'100% Online': 1, 'On Campus': 2}
+DURATION_PATTERN = r'(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>year|month|week)'
+MONTHS_PER_UNIT = {'year': 12.0, 'month': 1.0, 'week': 12.0 / 52}
+
+
+def source_files(source_dir=".", shard=DEFAULT_SHARD):
+    files = [shard['all_degrees_file'], shard['subjects_file']] + list(shard['field_files'])
+    return [f for f in files if os.path.exists(os.path.join(source_dir, f))]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_sources(source_dir=".", previous=None, shard=DEFAULT_SHARD):
+    # Only re-hash files whose mtime/size moved since the last build
+    previous = previous or {}
+    sources = {}
+    for name in source_files(source_dir, shard):
+        path = os.path.join(source_dir, name)
+        stat = os.stat(path)
+        old = previous.get(name)
+        if old and old['mtime_ns'] == stat.st_mtime_ns and old['size'] == stat.st_size:
+            sha256 = old['sha256']
+        else:
+            sha256 = file_sha256(path)
+        sources[name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha256}
+    return sources
+
+
+def _catalog_version(sources):
+    digest = hashlib.sha256(str(CATALOG_FORMAT_VERSION).encode())
+    for name in sorted(sources):
+        digest.update(name.encode())
+        digest.update(sources[name]['sha256'].encode())
+    return digest.hexdigest()[:12]
+
+
+def read_catalog_metadata(path=CATALOG_FILE):
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        return json.loads(metadata[METADATA_KEY])
+    except (pa.ArrowInvalid, KeyError, ValueError):
+        return None
+
+
+def _join_sorted_unique(frame, column, sep=', '):
+    values = frame[['Degree Name', column]].dropna()
+    values = values[values[column] != '']
+    values = values.drop_duplicates().sort_values(['Degree Name', column])
+    return values.groupby('Degree Name')[column].agg(sep.join)
+
+
+def aggregate_degrees(degrees, subjects, field_frames):
+    # Merge on 'Degree Name'
+    if 'Recommended Stage 2 Subjects' not in degrees.columns:
+        degrees = degrees.merge(subjects, on='Degree Name', how='left')
+
+    degrees['Degree Name'] = degrees['Degree Name'].astype(str).str.strip()
+    degrees['Mode'] = degrees['Mode'].str.strip().str.title()
+    degrees['Campus'] = degrees['Campus'].astype(str).str.strip()
+    degrees['Campus'] = degrees['Campus'].replace(['nan', 'NaN', ''], pd.NA)  # Set those to real NA
+    degrees['Start date'] = degrees['Start date'].astype(str).str.strip()
+
+    field_df = pd.concat(
+        [
+            pd.DataFrame({
+                'Degree Name': df_field['Degree Name'].astype(str).str.strip(),
+                'Mode': df_field['Mode'].str.strip().str.title(),
+                'Field': field_name,
+            })
+            for field_name, df_field in field_frames
+        ] or [pd.DataFrame(columns=['Degree Name', 'Mode', 'Field'])],
+        ignore_index=True
+    ).drop_duplicates()
+    degrees = degrees.merge(field_df, on=['Degree Name', 'Mode'], how='left')
+
+    # One row per degree; multi-valued columns become sorted, de-duplicated strings
+    agg_df = degrees.groupby('Degree Name')[FIRST_VALUE_COLUMNS].first()
+    agg_df['Field'] = _join_sorted_unique(degrees, 'Field', sep=' ; ')
+    agg_df['Mode'] = _join_sorted_unique(degrees, 'Mode')
+
+    campuses = degrees[['Degree Name']].assign(Campus=degrees['Campus']).dropna()
+    campuses = campuses.assign(Campus=campuses['Campus'].str.split(',')).explode('Campus')
+    campuses['Campus'] = campuses['Campus'].str.strip()
+    agg_df['Campus'] = _join_sorted_unique(campuses, 'Campus')
+
+    for column in MULTI_VALUE_COLUMNS:
+        agg_df[column] = _join_sorted_unique(degrees, column)
+
+    agg_df = agg_df.reset_index()[[
+        'Degree Name', 'Field', 'Mode', 'Campus', 'Start date', 'Guaranteed ATAR score',
+        'Duration', 'Assumed knowledge', 'Prerequisite', 'Recommended Stage 2 Subjects', 'Degree URL'
+    ]]
+
+    return typed_catalog(agg_df)
+
+
+def _split_list(series, sep):
+    return series.map(lambda x: [v.strip() for v in x.split(sep) if v.strip()] if isinstance(x, str) else [])
+
+
+def parse_duration_months(durations):
+    # '3 year(s) full-time' -> 36.0; NaN when no length is given
+    parts = durations.astype(str).str.lower().str.extract(DURATION_PATTERN)
+    return pd.to_numeric(parts['amount'], errors='coerce') * parts['unit'].map(MONTHS_PER_UNIT)
+
+
+def typed_catalog(agg_df):
+    # Numeric ATAR and duration, categorical display strings, and list/bitmask
+    # forms of the comma-joined columns so nothing is re-parsed at query time
+    agg_df = agg_df.copy()
+    agg_df['Guaranteed ATAR score'] = pd.to_numeric(agg_df['Guaranteed ATAR score'], errors='coerce')
+    agg_df['Field List'] = _split_list(agg_df['Field'], ';')
+    agg_df['Campus List'] = _split_list(agg_df['Campus'], ',')
+    agg_df['Mode Flags'] = _split_list(agg_df['Mode'], ',').map(
+        lambda modes: sum(MODE_FLAGS.get(mode, 0) for mode in set(modes))
+    ).astype('uint8')
+    agg_df['Duration (months)'] = parse_duration_months(agg_df['Duration'])
+
+    text_columns = ['Degree Name', 'Degree URL'] + CATEGORICAL_COLUMNS
+    agg_df[text_columns] = agg_df[text_columns].fillna('')
+    for column in CATEGORICAL_COLUMNS:
+        agg_df[column] = agg_df[column].astype(str).astype('category')
+    return agg_df
+
+
+def build_catalog(source_dir=".", output_file=CATALOG_FILE, sources=None, shard=DEFAULT_SHARD):
+    started = time.perf_counter()
+    if sources is None:
+        sources = fingerprint_sources(source_dir, shard=shard)
+
+    degrees = pd.read_csv(os.path.join(source_dir, shard['all_degrees_file']))
+    # Only some institutions publish recommended subjects; the column stays empty without them
+    subjects_path = os.path.join(source_dir, shard['subjects_file'])
+    if os.path.exists(subjects_path):
+        subjects = pd.read_csv(subjects_path)
+    else:
+        subjects = pd.DataFrame(columns=['Degree Name', 'Recommended Stage 2 Subjects'])
+    field_frames = [
+        (field_name, pd.read_csv(os.path.join(source_dir, file), usecols=['Degree Name', 'Mode']))
+        for file, field_name in shard['field_files'].items()
+        if os.path.exists(os.path.join(source_dir, file))
+    ]
+
+    agg_df = aggregate_degrees(degrees, subjects, field_frames)
+    agg_df['Institution'] = pd.Categorical([shard['name']] * len(agg_df))
+
+    metadata = {
+        'format_version': CATALOG_FORMAT_VERSION,
+        'shard': shard['key'],
+        'version': _catalog_version(sources),
+        'built_at': time.time(),
+        'build_seconds': round(time.perf_counter() - started, 4),
+        'sources': sources,
+    }
+    table = pa.Table.from_pandas(agg_df, preserve_index=False)
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata)})
+
+    # Write next to the target and swap in so readers never see a partial file
+    tmp_file = f"{output_file}.tmp-{os.getpid()}"
+    feather.write_feather(table, tmp_file, compression='uncompressed')
+    os.replace(tmp_file, output_file)
+    return metadata
+
+
+def catalog_is_stale(path=CATALOG_FILE, source_dir=".", shard=DEFAULT_SHARD):
+    metadata = read_catalog_metadata(path)
+    if metadata is None or metadata.get('format_version') != CATALOG_FORMAT_VERSION:
+        return True, None
+    sources = fingerprint_sources(source_dir, previous=metadata.get('sources'), shard=shard)
+    return _catalog_version(sources) != metadata.get('version'), sources
+
+
+def ensure_catalog(path=CATALOG_FILE, source_dir=".", shard=DEFAULT_SHARD):
+    stale, sources = catalog_is_stale(path, source_dir, shard)
+    if stale:
+        return build_catalog(source_dir, path, sources, shard)
+    return read_catalog_metadata(path)
+
+
+def load_catalog(path=CATALOG_FILE, source_dir=".", shard=DEFAULT_SHARD):
+    ensure_catalog(path, source_dir, shard)
+    return read_catalog(path)
+
+
+def _arrow_lists(arrow_type):
+    # List columns stay Arrow-backed; converting them to per-row Python
+    # lists cost more than reading the rest of the file
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def read_catalog(path=CATALOG_FILE):
+    table = feather.read_table(path, memory_map=True)
+    df = table.to_pandas(types_mapper=_arrow_lists)
+    df.attrs['version'] = json.loads(table.schema.metadata[METADATA_KEY])['version']
+    return df
+
+
+if __name__ == "__main__":
+    force = "--force" in sys.argv[1:]
+    if force:
+        info = build_catalog()
+    else:
+        info = ensure_catalog()
+    print(f"Catalog {CATALOG_FILE} version {info['version']} ({len(info['sources'])} source files)")
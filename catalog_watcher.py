@@ -0,0 +1,124 @@
+import atexit
+import threading
+import time
+
+from catalog import CATALOG_FILE, DEFAULT_SHARD, build_catalog, catalog_is_stale, load_catalog, read_catalog, read_catalog_metadata
+
+
+class CatalogWatcher:
+    # Holds the live catalog frame and polls its source CSVs from a background
+    # thread. A changed source is rebuilt into a new artifact (written to a temp
+    # file and renamed), read in full, and only then swapped in, so callers of
+    # current() get either the old frame or the new one, never a partial one.
+    # indexers ({kind: builder(df)}) are built for each new frame before the
+    # swap, on the watcher thread, so no request waits for them.
+
+    def __init__(self, path=CATALOG_FILE, source_dir=".", interval=30.0, settle_seconds=5.0, shard=DEFAULT_SHARD,
+                 indexers=None):
+        self.path = path
+        self.source_dir = source_dir
+        self.shard = shard
+        self.interval = interval
+        # Sources modified more recently than this may still be being written
+        self.settle_seconds = settle_seconds
+        self.indexers = indexers or {}
+
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error = None
+        self.last_checked = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._state = self._previous = None
+        started = time.perf_counter()
+        df = load_catalog(path, source_dir, shard)
+        load_seconds = round(time.perf_counter() - started, 4)
+        self._swap(df, read_catalog_metadata(path), load_seconds, self._build_indexes(df))
+
+        self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close, 5.0)
+
+    def current(self):
+        return self._state[0]
+
+    @property
+    def version(self):
+        return self.current().attrs.get('version')
+
+    def indexes(self, version):
+        # {kind: index} for the current frame, or the one it replaced (a run
+        # that read its frames just before a swap); None for anything older
+        for state in (self._state, self._previous):
+            if state is not None and state[0].attrs.get('version') == version:
+                return state[4]
+        return None
+
+    def info(self):
+        df, metadata, loaded_at, load_seconds, _ = self._state
+        metadata = metadata or {}
+        return {
+            'shard': self.shard['key'],
+            'version': df.attrs.get('version'),
+            'degrees': len(df),
+            'built_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(metadata.get('built_at', 0))),
+            'build_seconds': metadata.get('build_seconds'),
+            'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(loaded_at)),
+            'load_seconds': load_seconds,
+            'reloads': self.reloads,
+            'failed_reloads': self.failed_reloads,
+            'last_error': self.last_error,
+            'last_checked': self.last_checked and time.strftime('%H:%M:%S', time.localtime(self.last_checked)),
+        }
+
+    def check(self):
+        # One poll: rebuild if a source changed, swap if the artifact moved on
+        # (also picks up a catalog rebuilt by `python catalog.py`). True on swap.
+        with self._lock:
+            self.last_checked = time.time()
+            stale, sources = catalog_is_stale(self.path, self.source_dir, self.shard)
+            if stale:
+                if sources and self._settling(sources):
+                    return False
+                build_catalog(self.source_dir, self.path, sources, self.shard)
+
+            metadata = read_catalog_metadata(self.path)
+            if metadata is None or metadata.get('version') == self.version:
+                return False
+            started = time.perf_counter()
+            df = read_catalog(self.path)
+            load_seconds = round(time.perf_counter() - started, 4)
+            self._swap(df, metadata, load_seconds, self._build_indexes(df))
+            self.reloads += 1
+            print(f"Catalog {self.shard['key']} reloaded: version {self.version}, {len(df)} degrees "
+                  f"(build {metadata.get('build_seconds')}s, load {load_seconds}s)")
+            return True
+
+    def close(self, timeout=None):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _settling(self, sources):
+        newest = max(source['mtime_ns'] for source in sources.values()) / 1e9
+        return time.time() - newest < self.settle_seconds
+
+    def _build_indexes(self, df):
+        return {kind: build(df) for kind, build in self.indexers.items()}
+
+    def _swap(self, df, metadata, load_seconds=None, indexes=None):
+        # A single reference assignment; readers never see a frame without
+        # its indexes or a mix of versions
+        self._previous = self._state
+        self._state = (df, metadata, time.time(), load_seconds, indexes or {})
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # Keep serving the current version; retried on the next poll
+                self.failed_reloads += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Catalog {self.shard['key']} reload failed: {e}")
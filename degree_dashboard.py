@@ -1,17 +1,31 @@
 
 import streamlit as st
-import pandas as pd
 import os
-import re
-import gspread
-from google.oauth2.service_account import Credentials
+import time
+import pandas as pd
 from datetime import datetime
-
-scope = ["https://www.googleapis.com/auth/spreadsheets"]
-creds = Credentials.from_service_account_info(st.secrets["gcp"], scopes=scope)
-client = gspread.authorize(creds)
-SPREADSHEET_ID = '1_6ZyxLbQT2CyUdiRV5wLbjv8f8OimORe9ErVPxIraXQ'  
-sheet = client.open_by_key(SPREADSHEET_ID).sheet1
+import analytics
+import exports
+from exports import EXPORT_FORMATS, export_bytes, export_file_name, export_mime, page_frame
+from filter_engine import FACETS, sort_rows
+from result_cache import ResultCache
+from search_index import tokenize
+from shards import ShardedCatalog, discover_shards
+from sheets import SheetsRegistry
+import timing
+from timing import span, timed
+from usage_log import UsageLogger, log_feedback
+
+# Connects lazily and is shared by every session; the dashboard still runs
+# (without logging) when the gcp secrets are missing
+@st.cache_resource
+def get_sheets():
+    try:
+        service_account_info = dict(st.secrets["gcp"])
+    except Exception as e:
+        print(f"Google Sheets disabled: {e}")
+        service_account_info = None
+    return SheetsRegistry(service_account_info)
 
 # _________________________________________________
 
@@ -30,292 +44,255 @@ sheet = client.open_by_key(SPREADSHEET_ID).sheet1
 
 # ___________________________________________________
 
-HEADER = [
-    "Timestamp", "Selected Field", "Selected Degree", "Selected Campus", 
-    "Selected Mode", "Selected Start Date", "Sort Column", "Ascending", "Number of Results"
-]
-
-def ensure_header(sheet):
-    try:
-        first_row = sheet.row_values(1)
-        if first_row != HEADER:
-            sheet.delete_rows(1)  # clear first row if different
-            sheet.insert_row(HEADER, 1)
-    except Exception as e:
-        print(f"Error ensuring header row: {e}")
+# Downloads are written to a local WAL and sent to the sheet in batches
+# by a background thread, so the script never waits on Sheets round-trips
+@st.cache_resource
+def get_usage_logger():
+    sheets = get_sheets()
+    return UsageLogger(sheets.usage_sheet, on_error=sheets.report_error)
 
+@timed('log_usage')
 def log_filter_usage(log_data: dict):
-    if sheet is None:
-        print("Skipping logging: No Google Sheet connection.")
-        return
-
     try:
-        ensure_header(sheet)
-
-        values = [
-            log_data.get("timestamp", ""),
-            log_data.get("selected_field", ""),
-            log_data.get("selected_degree", ""),
-            log_data.get("selected_campus", ""),
-            log_data.get("selected_mode", ""),
-            log_data.get("selected_start_date", ""),
-            log_data.get("sort_column", ""),
-            log_data.get("ascending", ""),
-            str(log_data.get("num_results", ""))
-        ]
-        sheet.append_row(values)
+        get_usage_logger().log(log_data)
     except Exception as e:
         print(f"Failed to log filter usage: {e}")
 
 st.set_page_config(page_title="Australian Degrees Explorer", layout="wide")
+rerun_started = time.perf_counter()
+
+# Stage timings are only recorded with DEGREE_TIMING=1; the reporter prints a
+# summary line every DEGREE_TIMING_INTERVAL seconds and, with
+# DEGREE_TIMING_TEXTFILE set, writes Prometheus text for a textfile collector
+@st.cache_resource
+def get_timing_reporter():
+    if not timing.ENABLED:
+        return None
+    return timing.start_reporter(
+        float(os.environ.get("DEGREE_TIMING_INTERVAL", 60)), os.environ.get("DEGREE_TIMING_TEXTFILE")
+    )
 
-field_files = {
-        "AU_accounting_commerce_ecconomics_degrees_2026.csv": "Accounting, Commerce & Economics",
-        "AU_agriculture_animal_veterinary-science_degrees_2026.csv": "Agriculture, Animal & Veterinary Science",
-        "AU_allied-health_degrees_2026.csv": "Allied Health",
-        "AU_architecture-design_degrees_2026.csv": "Architecture & Design",
-        "AU_arts_humanities_social-sciences_degrees_2026.csv": "Arts, Humanities & Social Sciences",
-        "AU_aviation_degrees_2026.csv": "Aviation",
-        "AU_business_marketing_management_degrees_2026.csv": "Business, Marketing & Management",
-        "AU_computer-science_information-technology_degrees_2026.csv": "Computer Science & IT",
-        "AU_creative_media_communication_degrees_2026.csv": "Creative, Media & Communication",
-        "AU_engineering_degrees_2026.csv": "Engineering",
-        "AU_health_biomedical-sciences_degrees_2026.csv": "Health & Biomedical Sciences",
-        "AU_law_justice_degrees_2026.csv": "Law & Justice",
-        "AU_mathematics_data-science_degrees_2026.csv": "Mathematics & Data Science",
-        "AU_medicine_dentistry_oral-health_degrees_2026.csv": "Medicine, Dentistry & Oral Health",
-        "AU_music_degrees_2026.csv": "Music",
-        "AU_nursing_midwifery_degrees_2026.csv": "Nursing & Midwifery",
-        "AU_nutrition_food-science_degrees_2026.csv": "Nutrition & Food Science",
-        "AU_property_construction_real-estate_degrees_2026.csv": "Property, Construction & Real Estate",
-        "AU_psychology_social-work_degrees_2026.csv": "Psychology & Social Work",
-        "AU_science_environment_sustainability_degrees_2026.csv": "Science, Environment & Sustainability",
-        "AU_teaching_education_degrees_2026.csv": "Teaching & Education",
-        "AU_tourism_sports_events_degrees_2026.csv": "Tourism, Sport & Events"
-    }
+get_timing_reporter()
 
-CLEAN_FIELD_LIST = [
-        "Accounting, Commerce & Economics",
-        "Agriculture, Animal & Veterinary Science",
-        "Allied Health",
-        "Architecture & Design",
-        "Arts, Humanities & Social Sciences",
-        "Aviation",
-        "Business, Marketing & Management",
-        "Computer Science & IT",
-        "Creative, Media & Communication",
-        "Engineering",
-        "Health & Biomedical Sciences",
-        "Law & Justice",
-        "Mathematics & Data Science",
-        "Medicine, Dentistry & Oral Health",
-        "Music",
-        "Nursing & Midwifery",
-        "Nutrition & Food Science",
-        "Property, Construction & Real Estate",
-        "Psychology & Social Work",
-        "Science, Environment & Sustainability",
-        "Teaching & Education",
-        "Tourism, Sport & Events"
-    ]
-
-def remove_html_tags(text):
-    if isinstance(text, str):
-        # Remove all HTML tags
-        clean_text = re.sub(r'<.*?>', '', text)
-        return clean_text
-    return text
+# Folds new usage and feedback log rows into the analytics rollup every
+# DEGREE_ROLLUP_INTERVAL seconds; the admin Analytics view only reads the rollup
+@st.cache_resource
+def get_rollup_job():
+    return analytics.start_rollup(float(os.environ.get("DEGREE_ROLLUP_INTERVAL", 300)))
 
+get_rollup_job()
 
-# Load data
-@st.cache_data
-def load_data():
-    degrees = pd.read_csv("AU_all_degrees_2026.csv")
-    subjects = pd.read_csv("AU_Recommended_Stage_2_Subjects.csv")
-
-    # Merge on 'Degree Name'
-    if 'Recommended Stage 2 Subjects' not in degrees.columns:
-        degrees = degrees.merge(subjects, on='Degree Name', how='left')
-
-    degrees['Degree Name'] = degrees['Degree Name'].astype(str).str.strip()
-    degrees['Mode'] = degrees['Mode'].str.strip().str.title()
-    degrees['Campus'] = degrees['Campus'].astype(str).str.strip()
-    degrees['Campus'] = degrees['Campus'].replace(['nan', 'NaN', ''], pd.NA)  # Set those to real NA
-    degrees['Start date'] = degrees['Start date'].astype(str).str.strip()
-
-    field_rows = []
-    for file, field_name in field_files.items():
-        if os.path.exists(file):
-            df_field = pd.read_csv(file)
-            df_field['Degree Name'] = df_field['Degree Name'].astype(str).str.strip()
-            df_field['Mode'] = df_field['Mode'].str.strip().str.title()
-
-            for _, row in df_field.iterrows():
-                field_rows.append({
-                    'Degree Name': row['Degree Name'],
-                    'Mode': row['Mode'],
-                    'Field': field_name
-                })
-
-    field_df = pd.DataFrame(field_rows).drop_duplicates()
-    degrees = degrees.merge(field_df, on=['Degree Name', 'Mode'], how='left')
-
-    # Aggregate Fields and Modes so that each degree has one row
-    agg_df = degrees.groupby(['Degree Name']).agg({
-        'Field': lambda x: ' ; '.join(sorted(set(x.dropna()))),
-        'Mode': lambda x: ', '.join(sorted(set(x.dropna()))),
-        'Campus': lambda x: ', '.join(sorted(set(x.dropna()))),
-        'Start date': 'first',
-        'Guaranteed ATAR score': 'first',
-        'Duration': 'first',
-        'Assumed knowledge': lambda x: ', '.join(sorted(set(x.dropna()))),
-        'Prerequisite': lambda x: ', '.join(sorted(set(x.dropna()))),
-        'Recommended Stage 2 Subjects': lambda x: ', '.join(sorted(set(x.dropna()))),
-        'Degree URL': 'first',
-        # Add other columns you want to keep here...
-    }).reset_index()
-
-    # Add a list version of the field column for better filtering
-    agg_df['Field List'] = agg_df['Field'].apply(lambda x: [f.strip() for f in x.split(';')] if pd.notna(x) else [])
-
-    agg_df = agg_df.fillna('')
-    #agg_df['Campus'] = agg_df['Campus'].replace('nan', 'Magill, Mount Gambier, Whyalla') # Stupid nan showing up in certain degrees
-    
-    return agg_df
 
-df = load_data()
-    
-st.title("Adelaide University Degrees Explorer")
-st.markdown("Search, filter and download data on AU 2026 degrees")
+# Load data
+# One catalog shard per institution and year (see shards.py). A shard is only
+# read once a query touches it; its watcher then rebuilds it in the background
+# when a source CSV changes and swaps the new frame in without a restart.
+@st.cache_resource
+def get_catalog():
+    return ShardedCatalog(discover_shards())
 
-# --- Filter Data ---
-df['Start date'] = df['Start date'].astype(str).str.strip()
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
 
-individual_fields = sorted(
-    set(f.strip() for fields in df['Field'].dropna().unique() for f in fields.split(','))
-)
+catalog = get_catalog()
+shard_names = catalog.names()
+result_cache = get_result_cache()
 
 none_option = "-- None --"
+all_institutions = "All institutions"
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+def selected(value):
+    return None if value == none_option else value
+
+TABLE_COLUMNS = (['Institution'] if len(shard_names) > 1 else []) + exports.TABLE_COLUMNS
 
 # Initialise session_state
 if 'reset_triggered' not in st.session_state:
     st.session_state.reset_triggered = False
 
-for key in ['degree_name', 'campus', 'mode', 'start_date']:
+for key in ['campus', 'mode', 'start_date']:
     if key not in st.session_state:
         st.session_state[key] = none_option
 
 with st.sidebar:
     if st.button("Reset Filters"):
-        for key in ['field', 'degree_name', 'campus', 'mode', 'start_date']:
+        for key in ['field', 'campus', 'mode', 'start_date']:
             st.session_state[key] = none_option
+        st.session_state.degree_search = ""
+        st.session_state.match_subjects = []
+        st.session_state.match_atar = None
         st.rerun()
     
     st.header("Filter Degrees")
 
-    all_fields = sorted(CLEAN_FIELD_LIST)
-
-    # Filters using session state
+    # Only the selected institution's shard is loaded
+    if len(shard_names) > 1:
+        institution = st.selectbox(
+            "Select Institution", options=[all_institutions] + list(shard_names), index=1,
+            format_func=lambda key: shard_names.get(key, key), key='institution'
+        )
+    else:
+        institution = next(iter(shard_names))
+    shard_keys = list(shard_names) if institution == all_institutions else [institution]
+    shards = [catalog.shards[key] for key in shard_keys]
 
-    selected_field = st.selectbox("Select Field", options=[none_option] + CLEAN_FIELD_LIST, key='field')
-    
-    all_campuses = df['Campus'].dropna().str.split(',').explode().str.strip().unique()
-    all_campuses = sorted(all_campuses)
-    selected_campus = st.selectbox("Select Campus", options=[none_option] + all_campuses, key='campus')
+    # Shared read-only across sessions; never modify a frame in place. Each run
+    # reads the current frames once, so a reload mid-run never mixes versions.
+    with span('load_data'):
+        frames = catalog.frames(shard_keys)
 
-    mode_options = [
-        none_option,
-        "100% Online",
-        "On Campus",
-        "Both"]
+    # Option lists only change with the catalog version
+    catalog_version = tuple(shard_keys) + tuple(frame.attrs.get('version') for frame in frames)
+    options = result_cache.get_or_create(('options',) + catalog_version, lambda: catalog.options(shard_keys, frames))
 
-    selected_mode = st.selectbox("Select Mode", options=mode_options, key='mode')
-    
-    selected_start_date = st.selectbox("Select Start Date", options=[none_option] + sorted(df['Start date'].dropna().unique()), key='start_date')
+    # Filters using session state
+    selection = {
+        facet: selected(st.session_state.get(facet, none_option)) for facet in FACETS
+    }
+    match_subjects = st.session_state.get('match_subjects', [])
+    match_atar = st.session_state.get('match_atar')
+    search_terms = " ".join(tokenize(st.session_state.get('degree_search', "")))
+
+    # How many degrees each option would return with the rest of the
+    # selection kept; counted on the filter bitsets, shared across sessions
+    counts = result_cache.get_or_create(
+        ('facets',) + catalog_version + tuple(selection.values())
+        + (search_terms, tuple(sorted(match_subjects)), match_atar),
+        lambda: catalog.facet_counts(shard_keys, frames, selection, search_terms, match_subjects, match_atar),
+    )
 
-selected_degree = st.selectbox("Search a Degree Name", options=[none_option] + sorted(df['Degree Name'].dropna().unique()), key='degree_name')
+    def facet_label(facet):
+        def label(option):
+            return f"{option} ({counts[facet].get(selected(option), 0)})"
+        return label
 
-# --- Filter Data ---
-filtered_df = df.copy()
-filtered_df['Guaranteed ATAR score'] = pd.to_numeric(filtered_df['Guaranteed ATAR score'], errors='coerce')
+    selected_field = st.selectbox(
+        "Select Field", options=[none_option] + options['field'], format_func=facet_label('field'), key='field'
+    )
+    selected_campus = st.selectbox(
+        "Select Campus", options=[none_option] + options['campus'], format_func=facet_label('campus'), key='campus'
+    )
+    selected_mode = st.selectbox(
+        "Select Mode", options=[none_option] + options['mode'], format_func=facet_label('mode'), key='mode'
+    )
+    selected_start_date = st.selectbox(
+        "Select Start Date", options=[none_option] + options['start_date'],
+        format_func=facet_label('start_date'), key='start_date'
+    )
+    selection = dict(
+        field=selected(selected_field),
+        campus=selected(selected_campus),
+        mode=selected(selected_mode),
+        start_date=selected(selected_start_date),
+    )
 
-if selected_degree != none_option:
-    filtered_df = filtered_df[filtered_df['Degree Name'] == selected_degree]
+    st.header("Match My Subjects")
 
-if selected_campus != none_option:
-    filtered_df = filtered_df[
-        filtered_df['Campus'].astype(str).str.split(',').apply(
-            lambda campuses: selected_campus in [c.strip() for c in campuses]
-        )
-    ]
-
-if selected_mode != none_option:
-    if selected_mode == "Both":
-        # Mode contains both '100% Online' and 'On Campus'
-        filtered_df = filtered_df[
-            filtered_df['Mode'].str.contains("100% Online") & filtered_df['Mode'].str.contains("On Campus")
-        ]
-    else:
-        # Mode contains exactly the selected_mode only (no commas or others)
-        filtered_df = filtered_df[
-            filtered_df['Mode'].str.strip() == selected_mode
-        ]
+    match_subjects = st.multiselect("My Stage 2 subjects", options=options['subjects'], key='match_subjects')
+    match_atar = st.number_input("My ATAR", min_value=0.0, max_value=99.95, value=None, step=0.05, key='match_atar')
+    match_active = bool(match_subjects) or match_atar is not None
 
-if selected_start_date != none_option:
-    filtered_df = filtered_df[filtered_df['Start date'] == selected_start_date]
+if len(shards) == 1:
+    st.title(f"{shards[0].spec['name']} Degrees Explorer")
+    st.markdown(f"Search, filter and download data on {shards[0].spec['institution']} {shards[0].spec['year']} degrees")
+else:
+    st.title("Australian Degrees Explorer")
+    st.markdown(f"Search, filter and download data on degrees from {len(shards)} institutions")
 
-#if st.session_state.field != none_option:
- #   filtered_df = filtered_df[filtered_df['Field'].str.contains(st.session_state.field)]
+search_query = st.text_input(
+    "Search degrees", key='degree_search',
+    placeholder="Degree name, field or subject, e.g. 'comp sci' or 'chemistry'"
+)
+search_terms = " ".join(tokenize(search_query))
 
-if st.session_state.field != none_option:
-    filtered_df = filtered_df[filtered_df['Field List'].apply(lambda fields: st.session_state.field in fields)]
+# --- Filter Data ---
+# Degrees passing the filters; ranked by the subject match and/or the
+# search when those are active. Several institutions are queried in parallel.
+df, filtered_rows = catalog.query(shard_keys, frames, selection, search_terms, match_subjects, match_atar)
+filtered_df = df.iloc[filtered_rows]
 
 # --- Sort Options ---
 #st.markdown("##### Sort Options")
 col_sort1, col_sort2 = st.columns([2, 1])
 with col_sort1:
-    sort_col = st.selectbox("Sort by", options=['Degree Name', 'Guaranteed ATAR score', 'Duration'])
+    sort_options = ['Degree Name', 'Guaranteed ATAR score', 'Duration']
+    if search_terms or match_active:
+        sort_options = ['Relevance'] + sort_options
+    sort_col = st.selectbox("Sort by", options=sort_options)
 with col_sort2:
     ascending = st.radio("Sort order", ['Ascending', 'Descending'], horizontal=True) == 'Ascending'
 
 
 
+# --- Render (shared across sessions, keyed by catalog version + filters) ---
+def results_frame(rows):
+    return df.iloc[rows]
+
+result_key = (
+    df.attrs.get('version'),
+    selection['field'],
+    search_terms,
+    tuple(sorted(match_subjects)),
+    match_atar,
+    selection['campus'],
+    selection['mode'],
+    selection['start_date'],
+    sort_col,
+    ascending,
+)
+
 if filtered_df.empty:
     st.warning("No results found for the selected filters.")
 else:
-    filtered_df = filtered_df.sort_values(by=sort_col, ascending=ascending)
-
-    # --- Make Degree Name clickable for display ---
-    def make_clickable(name, url):
-        return f'<a href="{url}" target="_blank">{name}</a>'
-
-    display_df = filtered_df.copy()
-    display_df['Degree Name'] = display_df.apply(
-        lambda row: make_clickable(row['Degree Name'], row['Degree URL']), axis=1
+    sorted_rows = result_cache.get_or_create(
+        ('order',) + result_key, lambda: sort_rows(filtered_df, sort_col, ascending)
     )
-    display_df = display_df.drop(columns=['Degree URL'])
 
-    st.markdown(f"Showing {len(display_df)} Results")
-    st.write(display_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+    # Only the current page is sliced out of the catalog and sent to the browser
+    page_size = st.selectbox("Rows per page", options=PAGE_SIZES, index=1, key='page_size')
+    page_count = max(1, -(-len(sorted_rows) // page_size))
+    if st.session_state.get('page_key') != result_key[:-2] or st.session_state.get('page', 1) > page_count:
+        st.session_state.page_key = result_key[:-2]
+        st.session_state.page = 1
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key='page')
+    start = (page - 1) * page_size
+    page_rows = sorted_rows[start:start + page_size]
+
+    st.markdown(f"Showing {start + 1}-{start + len(page_rows)} of {len(sorted_rows)} Results")
+    with span('render_page'):
+        st.dataframe(
+            page_frame(df, page_rows, TABLE_COLUMNS),
+            hide_index=True,
+            column_config={
+                'Degree URL': st.column_config.LinkColumn("Link", display_text="Open"),
+                'Guaranteed ATAR score': st.column_config.NumberColumn(format="%.2f"),
+            },
+        )
 
     # --- Download ---
     with st.sidebar:
         st.markdown("---")
     
-        # Your CSV export code here
-        csv_export_df = filtered_df.copy()
-        csv_export_df['Degree Name'] = csv_export_df['Degree Name'].apply(remove_html_tags)
-        csv_export_df = csv_export_df.drop(columns=['Field List'], errors='ignore')
-    
-        csv = csv_export_df.to_csv(index=False).encode('utf-8')
-    
-        download_clicked = st.download_button("Download CSV", csv, "filtered_degrees.csv", "text/csv")
+        export_format = st.selectbox("Export format", options=list(EXPORT_FORMATS), key='export_format')
+
+        # Built on the download thread only when clicked, then cached per filter state
+        def build_export(rows=sorted_rows, key=('export', export_format) + result_key, export_format=export_format):
+            with span('export'):
+                return result_cache.get_or_create(key, lambda: export_bytes(results_frame(rows), export_format))
+
+        download_clicked = st.download_button(
+            f"Download {export_format}", build_export,
+            export_file_name(export_format), export_mime(export_format)
+        )
     
         if download_clicked:
             log_data = {
                 "timestamp": datetime.now().isoformat(),
                 "selected_field": st.session_state.get('field', '-- None --'),
-                "selected_degree": st.session_state.get('degree_name', '-- None --'),
+                "selected_degree": search_query or '-- None --',
                 "selected_campus": st.session_state.get('campus', '-- None --'),
                 "selected_mode": st.session_state.get('mode', '-- None --'),
                 "selected_start_date": st.session_state.get('start_date', '-- None --'),
@@ -340,14 +317,69 @@ with st.sidebar.expander("Feedback", expanded=False):
             "feedback": feedback_text
         }
 
-        # Save to Google Sheet if available
-        if client:
+        # Kept locally for the analytics rollup, then saved to Google Sheet if
+        # available; either copy counts as submitted
+        saved = False
+        try:
+            log_feedback(feedback_log)
+            saved = True
+        except OSError as e:
+            print(f"Failed to log feedback locally: {e}")
+        sheets = get_sheets()
+        if sheets.available:
             try:
-                feedback_sheet = client.open_by_key(SPREADSHEET_ID).worksheet("User Feedback")
-                feedback_sheet.append_row([feedback_log["timestamp"], feedback_log["rating"], feedback_log["feedback"]])
-                st.success("Thanks for your feedback!")
+                with span('feedback'):
+                    feedback_sheet = sheets.feedback_sheet()
+                    feedback_sheet.append_row([feedback_log["timestamp"], feedback_log["rating"], feedback_log["feedback"]])
+                saved = True
             except Exception as e:
-                st.error("Failed to submit feedback.")
+                sheets.report_error(e)
                 print(f"Feedback logging error: {e}")
+        if saved:
+            st.success("Thanks for your feedback!")
+        elif sheets.available:
+            st.error("Failed to submit feedback.")
         else:
             st.error("Google Sheet connection not active.")
+
+# Operator view: open the app with ?admin=1
+if st.query_params.get("admin") == "1":
+    with st.sidebar.expander("Catalog", expanded=False):
+        st.json(get_catalog().info())
+    with st.sidebar.expander("Result cache", expanded=False):
+        st.json(get_result_cache().stats())
+    with st.sidebar.expander("Timing", expanded=False):
+        if timing.ENABLED:
+            st.dataframe(pd.DataFrame.from_dict(timing.snapshot(), orient='index'))
+            st.code(timing.prometheus_text(), language=None)
+        else:
+            st.caption("Stage timings are off; start the app with DEGREE_TIMING=1.")
+
+    # Reads only the rollup file (re-parsed when it changes), never the raw logs or Sheets
+    with st.expander("Analytics", expanded=False):
+        try:
+            rollup_mtime = os.stat(analytics.ROLLUP_FILE).st_mtime_ns
+        except OSError:
+            rollup_mtime = None
+        rollup = result_cache.get_or_create(('analytics', rollup_mtime), analytics.load_rollup)
+        if not rollup['days']:
+            st.caption("No usage or feedback rolled up yet.")
+        else:
+            st.caption(f"Rollup updated {rollup['updated_at']}")
+            daily = analytics.daily_summary(rollup).set_index('Day')
+            st.markdown("##### Downloads and feedback per day")
+            st.line_chart(daily[['Downloads', 'No results', 'Feedback']])
+            col_a1, col_a2 = st.columns(2)
+            with col_a1:
+                st.markdown("##### Popular field / campus / mode")
+                st.dataframe(analytics.top_combinations(rollup), hide_index=True)
+            with col_a2:
+                st.markdown("##### Results per download")
+                st.bar_chart(analytics.result_distribution(rollup))
+            ratings = analytics.rating_histogram(rollup)
+            if not ratings.empty:
+                st.markdown("##### Ratings per day")
+                st.dataframe(ratings.join(daily[['Mean rating', 'Comments']]))
+
+if timing.ENABLED:
+    timing.record('rerun', time.perf_counter() - rerun_started)
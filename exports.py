@@ -0,0 +1,72 @@
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from catalog import DERIVED_COLUMNS
+
+CHUNK_ROWS = 5000
+
+# Label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+# Columns of the paged results table, in display order (plus 'Institution'
+# first when several institutions are shown)
+TABLE_COLUMNS = [
+    'Degree Name', 'Degree URL', 'Field', 'Mode', 'Campus', 'Start date', 'Guaranteed ATAR score',
+    'Duration', 'Assumed knowledge', 'Prerequisite', 'Recommended Stage 2 Subjects'
+]
+
+
+def page_frame(df, rows, columns=TABLE_COLUMNS):
+    # One page of results as st.dataframe shows it
+    return df.iloc[rows][columns]
+
+
+def export_frame(results_df):
+    export_df = results_df.drop(columns=DERIVED_COLUMNS, errors='ignore')
+    return export_df.assign(**{'Degree Name': export_df['Degree Name'].str.replace(r'<.*?>', '', regex=True)})
+
+
+def iter_csv_chunks(export_df, chunk_rows=CHUNK_ROWS):
+    # Header first, then CSV-encoded blocks of chunk_rows rows
+    for start in range(0, max(len(export_df), 1), chunk_rows):
+        chunk = export_df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode('utf-8')
+
+
+def export_bytes(results_df, export_format, chunk_rows=CHUNK_ROWS):
+    export_df = export_frame(results_df)
+    buffer = io.BytesIO()
+
+    if export_format == "CSV":
+        for chunk in iter_csv_chunks(export_df, chunk_rows):
+            buffer.write(chunk)
+    elif export_format == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as f:
+            for chunk in iter_csv_chunks(export_df, chunk_rows):
+                f.write(chunk)
+    elif export_format == "Parquet":
+        schema = pa.Schema.from_pandas(export_df, preserve_index=False)
+        with pq.ParquetWriter(buffer, schema) as writer:
+            for start in range(0, len(export_df), chunk_rows):
+                chunk = export_df.iloc[start:start + chunk_rows]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    return buffer.getvalue()
+
+
+def export_file_name(export_format, stem="filtered_degrees"):
+    return f"{stem}.{EXPORT_FORMATS[export_format][0]}"
+
+
+def export_mime(export_format):
+    return EXPORT_FORMATS[export_format][1]
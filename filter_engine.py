@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from catalog import MODE_FLAGS
+from timing import timed
+
+MODE_OPTIONS = ["100% Online", "On Campus", "Both"]
+# Sidebar filters, as FilterIndex.mask() arguments
+FACETS = ['field', 'campus', 'mode', 'start_date']
+# Set bits per byte value, for counting the degrees in a packed bitset
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+# Sort options shown as display text but ordered by their parsed value
+SORT_KEYS = {'Duration': 'Duration (months)'}
+
+
+def count_rows(bits):
+    return int(POPCOUNT[bits].sum(dtype=np.int64))
+
+
+class FilterIndex:
+    # One packed bitset per sidebar option; a query is a chain of ANDs.
+    # Each facet's bitsets are rows of one matrix, so counting every option
+    # of a facet is a single AND + popcount over that matrix.
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.all_rows = np.packbits(np.ones(self.size, dtype=bool))
+        self.empty = np.zeros_like(self.all_rows)
+
+        self.matrices = {}
+        self.campus = self._build('campus', df['Campus List'].reset_index(drop=True).explode().dropna())
+        self.start_date = self._build('start_date', df['Start date'].astype(str).reset_index(drop=True))
+        self.field = self._build('field', df['Field List'].reset_index(drop=True).explode().dropna())
+
+        # "Both" means the degree is offered online and on campus
+        flags = df['Mode Flags'].to_numpy()
+        online, on_campus = MODE_FLAGS["100% Online"], MODE_FLAGS["On Campus"]
+        self.mode = self._stack('mode', {
+            "100% Online": np.packbits(flags == online),
+            "On Campus": np.packbits(flags == on_campus),
+            "Both": np.packbits(flags == online | on_campus),
+        })
+
+        # Sidebar option lists, fixed for this catalog version
+        self.options = {facet: list(getattr(self, facet)) for facet in FACETS}
+
+    def _build(self, facet, values):
+        bitsets = {}
+        positions = pd.Series(values.index.to_numpy(), index=values.to_numpy())
+        for value, rows in positions.groupby(level=0):
+            mask = np.zeros(self.size, dtype=bool)
+            mask[rows.to_numpy()] = True
+            bitsets[value] = np.packbits(mask)
+        return self._stack(facet, bitsets)
+
+    def _stack(self, facet, bitsets):
+        # Keeps the facet's bitsets as rows of one (options x bytes) matrix
+        # and returns option -> view of its row
+        if bitsets:
+            matrix = np.stack(list(bitsets.values()))
+        else:
+            matrix = np.zeros((0, len(self.all_rows)), dtype=np.uint8)
+        self.matrices[facet] = matrix
+        return dict(zip(bitsets, matrix))
+
+    def mask(self, field=None, campus=None, mode=None, start_date=None):
+        result = self.all_rows
+        for bitsets, value in (
+            (self.field, field),
+            (self.campus, campus),
+            (self.mode, mode),
+            (self.start_date, start_date),
+        ):
+            if value is not None:
+                result = np.bitwise_and(result, bitsets.get(value, self.empty))
+        return result
+
+    def facet_counts(self, within=None, **selection):
+        # Facet -> {option: degrees it would return with the other facets'
+        # selections kept}, plus None -> the count with this facet unset.
+        # `within` is an optional packed bitset (search / subject match) that
+        # every count is restricted to.
+        counts = {}
+        for facet in FACETS:
+            base = self.mask(**{name: value for name, value in selection.items() if name != facet})
+            if within is not None:
+                base = np.bitwise_and(base, within)
+            option_counts = POPCOUNT[np.bitwise_and(self.matrices[facet], base)].sum(axis=1, dtype=np.int64)
+            counts[facet] = dict(zip(self.options[facet], option_counts.tolist()))
+            counts[facet][None] = count_rows(base)
+        return counts
+
+    def query(self, **selection):
+        # Row positions into the catalog frame, in catalog order
+        bits = np.unpackbits(self.mask(**selection), count=self.size)
+        return np.flatnonzero(bits)
+
+
+@timed('sort')
+def sort_rows(filtered_df, sort_col, ascending):
+    # Catalog row positions of the filtered degrees in display order;
+    # 'Relevance' keeps the ranked order the rows arrived in
+    if sort_col == 'Relevance':
+        rows = filtered_df.index.to_numpy()
+        return rows if ascending else rows[::-1]
+    return filtered_df.sort_values(by=SORT_KEYS.get(sort_col, sort_col), ascending=ascending, kind='stable').index.to_numpy()
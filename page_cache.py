@@ -0,0 +1,52 @@
+import hashlib
+import json
+import os
+import time
+
+PAGE_CACHE_FILE = "degree_page_cache.json"
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageCache:
+    # Degree URL -> validators from the last successful parse:
+    # {'etag', 'last_modified', 'sha256', 'checked_at'}
+
+    def __init__(self, path=PAGE_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def request_headers(self, url):
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url, sha256):
+        entry = self.entries.get(url)
+        return entry is not None and entry.get('sha256') == sha256
+
+    def put(self, url, etag=None, last_modified=None, sha256=None):
+        self.entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': sha256,
+            'checked_at': time.time(),
+        }
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
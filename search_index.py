@@ -0,0 +1,196 @@
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+# Column -> weight of a hit in that column
+SEARCH_FIELDS = {
+    'Degree Name': 3.0,
+    'Field': 2.0,
+    'Prerequisite': 1.0,
+    'Assumed knowledge': 1.0,
+    'Recommended Stage 2 Subjects': 1.0,
+    'Degree URL': 0.5,
+}
+
+TOKEN_PATTERN = r'[a-z0-9]+'
+# Words in nearly every degree name; dropped from queries unless nothing else is left
+STOPWORDS = {'a', 'and', 'bachelor', 'for', 'in', 'majoring', 'of', 'or', 'the', 'with'}
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+MAX_EXPANSIONS = 32
+MIN_FUZZY_LENGTH = 4
+MIN_SIMILARITY = 0.35
+# Scores are ranked as integers in steps of 1/SCORE_STEPS
+SCORE_STEPS = 1000
+# URL tokens in more than this share of rows (scheme, host, "study",
+# "degrees", "dom") say nothing about the degree and are not indexed
+URL_BOILERPLATE_SHARE = 0.5
+
+
+def tokenize(text):
+    return re.findall(TOKEN_PATTERN, text.lower())
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    # Token -> (row positions, best field weight per row), plus a sorted token
+    # list for prefix lookups and a trigram -> token index for typo tolerance
+
+    def __init__(self, df):
+        self.size = len(df)
+        frames = []
+        for column, weight in SEARCH_FIELDS.items():
+            if column not in df.columns:
+                continue
+            tokens = df[column].astype(str).str.lower().str.findall(TOKEN_PATTERN)
+            tokens = tokens.reset_index(drop=True).explode().dropna()
+            if column == 'Degree URL':
+                rows_per_token = pd.Series(tokens.index, index=tokens.to_numpy()).groupby(level=0).nunique()
+                boilerplate = rows_per_token.index[rows_per_token > URL_BOILERPLATE_SHARE * self.size]
+                tokens = tokens[~tokens.isin(boilerplate)]
+            frames.append(pd.DataFrame({'token': tokens.to_numpy(), 'row': tokens.index.to_numpy(), 'weight': weight}))
+
+        postings = pd.concat(frames, ignore_index=True).groupby(['token', 'row'], sort=True)['weight'].max().reset_index()
+        self.tokens = postings['token'].drop_duplicates().tolist()
+        bounds = np.flatnonzero(postings['token'].to_numpy()[1:] != postings['token'].to_numpy()[:-1]) + 1
+        rows = np.split(postings['row'].to_numpy(dtype=np.int64), bounds)
+        weights = np.split(postings['weight'].to_numpy(dtype=np.float64), bounds)
+        self.postings = dict(zip(self.tokens, zip(rows, weights)))
+
+        trigram_tokens = {}
+        for token_id, token in enumerate(self.tokens):
+            for gram in trigrams(token):
+                trigram_tokens.setdefault(gram, []).append(token_id)
+        self.trigram_tokens = {gram: np.array(ids, dtype=np.int64) for gram, ids in trigram_tokens.items()}
+        self.trigram_counts = np.array([len(trigrams(token)) for token in self.tokens], dtype=np.int64)
+
+    def _expand(self, term):
+        # Candidate index tokens for one query term with their match weights
+        matches = {}
+        if term in self.postings:
+            matches[term] = EXACT_WEIGHT
+
+        start = bisect.bisect_left(self.tokens, term)
+        for token in self.tokens[start:start + MAX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, PREFIX_WEIGHT)
+
+        if not matches and len(term) >= MIN_FUZZY_LENGTH:
+            grams = trigrams(term)
+            ids = [self.trigram_tokens[gram] for gram in grams if gram in self.trigram_tokens]
+            if ids:
+                shared = np.bincount(np.concatenate(ids), minlength=len(self.tokens))
+                candidates = np.flatnonzero(shared)
+                similarity = shared[candidates] / (len(grams) + self.trigram_counts[candidates] - shared[candidates])
+                best = np.argsort(-similarity)[:MAX_EXPANSIONS]
+                for token_id, score in zip(candidates[best], similarity[best]):
+                    if score >= MIN_SIMILARITY:
+                        matches[self.tokens[token_id]] = FUZZY_WEIGHT * score
+        return matches
+
+    def _term_hits(self, matches, keep=None):
+        # (rows, scores) for one term's expansions: unique rows, best
+        # expansion per row, limited to the rows set in the boolean mask `keep`
+        parts = []
+        for token, weight in matches.items():
+            rows, scores = self.postings[token]
+            if keep is not None:
+                kept = keep[rows]
+                rows, scores = rows[kept], scores[kept]
+            if len(rows):
+                parts.append((rows, scores * weight))
+        if not parts:
+            return np.array([], dtype=np.int64), np.array([])
+        if len(parts) == 1:
+            return parts[0]
+        if sum(len(rows) for rows, _ in parts) > self.size // 8:
+            best = np.zeros(self.size)
+            for rows, scores in parts:
+                best[rows] = np.maximum(best[rows], scores)
+            rows = np.flatnonzero(best > 0)  # nonzero() on a bool mask is far faster
+            return rows, best[rows]
+        rows = np.concatenate([rows for rows, _ in parts])
+        scores = np.concatenate([scores for _, scores in parts])
+        order = np.lexsort((-scores, rows))
+        rows, scores = rows[order], scores[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        return rows[first], scores[first]
+
+    def _term_scores(self, matches, rows):
+        # Best score of one term's expansions at each of `rows`, 0 where it
+        # doesn't match. Scattering a posting list into a dense buffer and
+        # reading `rows` back beats a binary search per row.
+        best = np.zeros(len(rows))
+        dense = np.zeros(self.size)
+        for token, weight in matches.items():
+            token_rows, scores = self.postings[token]
+            dense[token_rows] = scores
+            best = np.maximum(best, dense[rows] * weight)
+            dense[token_rows] = 0
+        return best
+
+    def _terms(self, query):
+        terms = list(dict.fromkeys(tokenize(query)))
+        return [term for term in terms if term not in STOPWORDS] or terms
+
+    def mask(self, query):
+        # Packed bitset of the rows matching every query term, unranked
+        terms = self._terms(query)
+        hits = np.ones(self.size, dtype=bool)
+        for term in terms:
+            term_hits = np.zeros(self.size, dtype=bool)
+            for token in self._expand(term):
+                term_hits[self.postings[token][0]] = True
+            hits &= term_hits
+        return np.packbits(hits)
+
+    def search(self, query, limit=None, within=None):
+        # Row positions matching every query term, ranked by weighted score and
+        # restricted to the packed bitset `within` before any ranking. Work is
+        # proportional to the posting lists touched, not the catalog size.
+        terms = self._terms(query)
+        keep = None if within is None else np.unpackbits(within, count=self.size).view(bool)
+        if not terms:
+            rows = np.arange(self.size) if keep is None else np.flatnonzero(keep)
+            return rows[:limit]
+
+        # Intersect starting from the rarest term; the others are only looked
+        # up at the rows still in the running
+        expansions = sorted((self._expand(term) for term in terms),
+                            key=lambda matches: sum(len(self.postings[token][0]) for token in matches))
+        rows, total = self._term_hits(expansions[0], keep)
+        for matches in expansions[1:]:
+            if not len(rows):
+                break
+            scores = self._term_scores(matches, rows)
+            found = scores > 0
+            rows, total = rows[found], total[found] + scores[found]
+        if not len(rows):
+            return np.array([], dtype=np.int64)
+
+        # One integer rank per row; rows arrive in catalog order so a stable
+        # sort breaks ties by position
+        steps = np.rint(total * SCORE_STEPS).astype(np.int64)
+        rank = steps.max() - steps
+        if limit is not None and limit < len(rows):
+            # Only the top `limit` rows get sorted: everything ranked above
+            # the cutoff, then the earliest rows tied with it
+            cutoff = np.partition(rank, limit - 1)[limit - 1]
+            top = np.flatnonzero(rank < cutoff)
+            tied = np.flatnonzero(rank == cutoff)[:limit - len(top)]
+            top = np.concatenate([top, tied])
+            top.sort()
+            rows, rank = rows[top], rank[top]
+        # Small ranks fit 16 bits, where numpy's stable sort is a radix sort
+        if rank.max(initial=0) < 2 ** 16:
+            rank = rank.astype(np.uint16)
+        return rows[np.argsort(rank, kind='stable')]
@@ -0,0 +1,220 @@
+import glob
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from catalog import DEFAULT_SHARD, build_catalog, ensure_catalog, make_shard
+from catalog_watcher import CatalogWatcher
+from filter_engine import FACETS, FilterIndex
+from search_index import SearchIndex
+from subjects import SubjectIndex, load_vocabulary
+from timing import span
+
+SHARD_ROOT = "shards"
+SHARD_CONFIG = "shard.json"
+
+# Per-shard indexes, built by the shard's watcher alongside each frame it loads
+INDEX_BUILDERS = {
+    'filter': FilterIndex,
+    'search': SearchIndex,
+    'subjects': lambda df: SubjectIndex(df, load_vocabulary(df)),
+}
+
+
+def discover_shards(root=SHARD_ROOT):
+    # The AU 2026 catalog in the repo root, plus one shard per
+    # shards/<INSTITUTION>/<YEAR>/shard.json holding
+    # {"name": ..., "field_files": {csv file: field name}, "study_areas": {url: csv file}}
+    # next to that shard's scraped CSVs
+    shards = {DEFAULT_SHARD['key']: DEFAULT_SHARD}
+    for config_path in sorted(glob.glob(os.path.join(root, '*', '*', SHARD_CONFIG))):
+        source_dir = os.path.dirname(config_path)
+        institution = os.path.basename(os.path.dirname(source_dir))
+        year = os.path.basename(source_dir)
+        try:
+            with open(config_path, encoding="utf-8") as f:
+                config = json.load(f)
+            shard = make_shard(institution, int(year), config['name'], config['field_files'],
+                               source_dir, config.get('study_areas'))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Skipping shard config {config_path}: {e}")
+            continue
+        shards[shard['key']] = shard
+    return shards
+
+
+class Shard:
+    # One institution/year: its catalog is only read (and watched) once a
+    # query touches it
+
+    def __init__(self, spec, interval=30.0):
+        self.spec = spec
+        self.interval = interval
+        self._watcher = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._watcher is not None
+
+    def watcher(self):
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = CatalogWatcher(
+                    self.spec['catalog_file'], self.spec['source_dir'], self.interval, shard=self.spec,
+                    indexers=INDEX_BUILDERS,
+                )
+            return self._watcher
+
+    def frame(self):
+        return self.watcher().current()
+
+    def index(self, kind, df):
+        # The watcher builds every index before it swaps a frame in; a frame
+        # two reloads old gets a one-off build, outside any shared lock
+        indexes = self.watcher().indexes(df.attrs.get('version'))
+        if indexes is None:
+            return INDEX_BUILDERS[kind](df)
+        return indexes[kind]
+
+    def rows(self, df, selection, search_terms="", subjects=(), atar=None):
+        # Catalog row positions passing the sidebar filters; ranked by the
+        # subject match and/or search when those are active
+        with span('filter'):
+            bits = self.index('filter', df).mask(**selection)
+            rows = np.flatnonzero(np.unpackbits(bits, count=len(df)))
+        if subjects or atar is not None:
+            with span('match'):
+                match_rows, _ = self.index('subjects', df).match(subjects, atar)
+                rows = match_rows[np.isin(match_rows, rows, assume_unique=True)]
+                mask = np.zeros(len(df), dtype=bool)
+                mask[rows] = True
+                bits = np.packbits(mask)
+        if search_terms:
+            with span('search'):
+                rows = self.index('search', df).search(search_terms, within=bits)
+        return rows
+
+    def options(self, df):
+        # Sidebar option lists for this catalog version: the filter facets
+        # plus the subject vocabulary
+        options = dict(self.index('filter', df).options)
+        options['field'] = list(dict.fromkeys(list(self.spec['field_files'].values()) + options['field']))
+        options['subjects'] = self.index('subjects', df).vocabulary.names
+        return options
+
+    def facet_counts(self, df, selection, search_terms="", subjects=(), atar=None):
+        # Per-option degree counts under the current selection, restricted to
+        # the subject match and search like rows() is
+        within = None
+        if subjects or atar is not None:
+            with span('match'):
+                within = self.index('subjects', df).eligible(subjects, atar)
+        if search_terms:
+            with span('search'):
+                hits = self.index('search', df).mask(search_terms)
+            within = hits if within is None else np.bitwise_and(within, hits)
+        with span('facets'):
+            return self.index('filter', df).facet_counts(within, **selection)
+
+
+def combine_options(options):
+    # Union of several shards' option lists, fields in shard order, the rest sorted
+    combined = {'field': list(dict.fromkeys(field for shard_options in options for field in shard_options['field']))}
+    for name in FACETS[1:] + ['subjects']:
+        combined[name] = sorted(set().union(*(shard_options[name] for shard_options in options)))
+    combined['mode'] = options[0]['mode']
+    return combined
+
+
+def combine_counts(counts):
+    # Facet counts summed over shards
+    combined = {facet: {} for facet in FACETS}
+    for shard_counts in counts:
+        for facet, option_counts in shard_counts.items():
+            for option, count in option_counts.items():
+                combined[facet][option] = combined[facet].get(option, 0) + count
+    return combined
+
+
+def combine_results(frames, results, ranked):
+    # One frame holding just the matching rows of each shard. Ranked results
+    # are interleaved by rank within their shard, since scores from different
+    # shards' indexes are not comparable.
+    combined = pd.concat([frame.iloc[rows] for frame, rows in zip(frames, results)], ignore_index=True)
+    if ranked:
+        shard_ids = np.concatenate([np.full(len(rows), i) for i, rows in enumerate(results)])
+        ranks = np.concatenate([np.arange(len(rows)) for rows in results])
+        combined = combined.iloc[np.lexsort((shard_ids, ranks))].reset_index(drop=True)
+    combined.attrs['version'] = '+'.join(frame.attrs.get('version') or '' for frame in frames)
+    return combined
+
+
+class ShardedCatalog:
+    # Shard key -> Shard. Queries over one shard run inline; queries over
+    # several fan out on a thread pool and only load the shards they name.
+
+    def __init__(self, specs, interval=30.0, max_workers=8):
+        self.shards = {key: Shard(spec, interval) for key, spec in specs.items()}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shard")
+
+    def names(self):
+        return {key: f"{shard.spec['name']} {shard.spec['year']}" for key, shard in self.shards.items()}
+
+    def frames(self, keys):
+        shards = [self.shards[key] for key in keys]
+        if len(shards) == 1:
+            return [shards[0].frame()]
+        return list(self._executor.map(Shard.frame, shards))
+
+    def query(self, keys, frames, selection, search_terms="", subjects=(), atar=None):
+        # Returns (frame, row positions into it). frames are the ones the
+        # caller read for this run, so the result matches its options and counts.
+        shards = [self.shards[key] for key in keys]
+        if len(shards) == 1:
+            return frames[0], shards[0].rows(frames[0], selection, search_terms, subjects, atar)
+
+        results = list(self._executor.map(
+            lambda item: item[0].rows(item[1], selection, search_terms, subjects, atar), zip(shards, frames)
+        ))
+        ranked = bool(search_terms or subjects or atar is not None)
+        combined = combine_results(frames, results, ranked)
+        return combined, np.arange(len(combined))
+
+    def options(self, keys, frames):
+        # Computed once per catalog version; callers cache on the frames' versions
+        options = [self.shards[key].options(frame) for key, frame in zip(keys, frames)]
+        return options[0] if len(options) == 1 else combine_options(options)
+
+    def facet_counts(self, keys, frames, selection, search_terms="", subjects=(), atar=None):
+        shards = [self.shards[key] for key in keys]
+        if len(shards) == 1:
+            return shards[0].facet_counts(frames[0], selection, search_terms, subjects, atar)
+        return combine_counts(self._executor.map(
+            lambda item: item[0].facet_counts(item[1], selection, search_terms, subjects, atar), zip(shards, frames)
+        ))
+
+    def info(self):
+        return {
+            key: shard.watcher().info() if shard.loaded else "not loaded"
+            for key, shard in self.shards.items()
+        }
+
+
+if __name__ == "__main__":
+    # python shards.py [--force] [SHARD_KEY ...]: build each shard on its own
+    args = sys.argv[1:]
+    force = "--force" in args
+    specs = discover_shards()
+    for key in [arg for arg in args if arg != "--force"] or list(specs):
+        spec = specs[key]
+        if force:
+            info = build_catalog(spec['source_dir'], spec['catalog_file'], shard=spec)
+        else:
+            info = ensure_catalog(spec['catalog_file'], spec['source_dir'], spec)
+        print(f"Shard {key}: {spec['catalog_file']} version {info['version']} ({len(info['sources'])} source files)")
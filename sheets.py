@@ -0,0 +1,68 @@
+import threading
+
+import gspread
+from google.oauth2.service_account import Credentials
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+SPREADSHEET_ID = '1_6ZyxLbQT2CyUdiRV5wLbjv8f8OimORe9ErVPxIraXQ'
+FEEDBACK_WORKSHEET = "User Feedback"
+
+# HTTP statuses after which the cached client/worksheets are dropped and rebuilt
+RECONNECT_STATUSES = {401, 403}
+
+
+class SheetsRegistry:
+    # Process-wide, lazily connected client. Nothing touches the network until
+    # a worksheet is first asked for; the google-auth session behind gspread
+    # refreshes expired tokens itself, and reset() forces a full reconnect.
+
+    def __init__(self, service_account_info, spreadsheet_id=SPREADSHEET_ID):
+        self.service_account_info = service_account_info
+        self.spreadsheet_id = spreadsheet_id
+        self.connects = 0
+        self._lock = threading.Lock()
+        self._spreadsheet = None
+        self._worksheets = {}
+
+    @property
+    def available(self):
+        return bool(self.service_account_info)
+
+    def _connect(self):
+        creds = Credentials.from_service_account_info(self.service_account_info, scopes=SCOPES)
+        client = gspread.authorize(creds)
+        self._spreadsheet = client.open_by_key(self.spreadsheet_id)
+        self._worksheets = {}
+        self.connects += 1
+
+    def worksheet(self, name=None):
+        # name=None is the first sheet, where usage rows go
+        if not self.available:
+            return None
+        with self._lock:
+            if name not in self._worksheets:
+                if self._spreadsheet is None:
+                    self._connect()
+                if name is None:
+                    self._worksheets[name] = self._spreadsheet.sheet1
+                else:
+                    self._worksheets[name] = self._spreadsheet.worksheet(name)
+            return self._worksheets[name]
+
+    def usage_sheet(self):
+        return self.worksheet()
+
+    def feedback_sheet(self):
+        return self.worksheet(FEEDBACK_WORKSHEET)
+
+    def reset(self):
+        with self._lock:
+            self._spreadsheet = None
+            self._worksheets = {}
+
+    def report_error(self, error):
+        # Auth and connection failures mean the session is unusable; quota
+        # errors (429) are left to the caller's backoff
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        if status in RECONNECT_STATUSES or isinstance(error, (ConnectionError, OSError)):
+            self.reset()
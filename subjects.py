@@ -0,0 +1,173 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+SACE_SUBJECTS_FILE = "SACE subjects.xlsx"
+
+# Spellings used in the degree pages -> canonical SACE Stage 2 subject name
+ALIASES = {
+    'Mathematics Methods': 'Mathematical Methods',
+    'Maths Methods': 'Mathematical Methods',
+    'Specialist Maths': 'Specialist Mathematics',
+    'General Maths': 'General Mathematics',
+    'Politics': 'Politics, Power and People',
+    'Politics, Power': 'Politics, Power and People',
+    'Business Inovation': 'Business Innovation',
+    'Digial Communication Solutions': 'Digital Communication Solutions',
+}
+
+# Prerequisites are clauses joined by "PLUS" or ";", all of which must be met.
+# A clause that lists alternatives ("Biology, Chemistry or Physics", "Any one
+# of ...") needs one listed subject, otherwise all of them. "(or equivalent)"
+# is dropped first so it doesn't read as an alternative.
+EQUIVALENT_PATTERN = r'\(\s*or equivalent\s*\)'
+CLAUSE_PATTERN = r';|\bplus\b'
+ANY_OF_PATTERN = r'\bor\b|\bany\b'
+
+# How much a matched subject adds to a degree's ranking score
+ASSUMED_WEIGHT = 2
+RECOMMENDED_WEIGHT = 1
+# Catalog columns whose subjects rank eligible degrees
+RANKED_COLUMNS = {'Assumed knowledge': ASSUMED_WEIGHT, 'Recommended Stage 2 Subjects': RECOMMENDED_WEIGHT}
+
+
+def normalize(text):
+    text = str(text).lower().replace('’', "'").replace('*', '')
+    text = re.sub(r'\s*[-–—]\s*', ' - ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def load_sace_subjects(path=SACE_SUBJECTS_FILE):
+    # Stage 2 subject names from the SACE list; empty when the workbook (or
+    # openpyxl) is missing, in which case only ALIASES targets are known
+    try:
+        subjects = pd.read_excel(path, usecols=['Stage_2_Subject'])['Stage_2_Subject']
+    except (ImportError, OSError, ValueError) as e:
+        print(f"SACE subject list unavailable: {e}")
+        return []
+    return sorted(set(subjects.dropna().str.strip().str.rstrip('*')))
+
+
+def parse_prerequisite(text, vocabulary):
+    # Tuple of (any_of, subjects) clauses; clauses naming no known subject
+    # can't be checked and are left out
+    if not isinstance(text, str):
+        return ()
+    text = re.sub(EQUIVALENT_PATTERN, '', text.lower())
+    clauses = []
+    for part in re.split(CLAUSE_PATTERN, text):
+        subjects = vocabulary.extract(part)
+        if subjects:
+            clauses.append((bool(re.search(ANY_OF_PATTERN, part)), tuple(subjects)))
+    return tuple(clauses)
+
+
+def satisfies(clauses, subjects, used=frozenset()):
+    # Each clause is met by subjects no earlier clause used, so "PLUS any one
+    # additional subject" needs a second subject
+    if not clauses:
+        return True
+    any_of, required = clauses[0]
+    if len(clauses) == 1 and not used:
+        return not subjects.isdisjoint(required) if any_of else subjects.issuperset(required)
+    if not any_of:
+        return set(required) <= subjects - used and satisfies(clauses[1:], subjects, used | set(required))
+    return any(satisfies(clauses[1:], subjects, used | {subject})
+               for subject in required if subject in subjects and subject not in used)
+
+
+class SubjectVocabulary:
+    # Canonical subject names and a longest-first phrase matcher over their
+    # normalized spellings, so "English" never swallows "English Literary Studies"
+
+    def __init__(self, names):
+        self.names = sorted(set(names) | set(ALIASES.values()))
+        spellings = {normalize(name): name for name in self.names}
+        spellings.update({normalize(alias): name for alias, name in ALIASES.items()})
+        self.spellings = spellings
+        alternatives = sorted(spellings, key=len, reverse=True)
+        self.pattern = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(s) for s in alternatives) + r')(?!\w)')
+
+    def extract(self, text):
+        # Canonical subject names mentioned in a free-text requirement
+        if not isinstance(text, str) or not text:
+            return []
+        return list(dict.fromkeys(self.spellings[m] for m in self.pattern.findall(normalize(text))))
+
+
+def load_vocabulary(df=None, path=SACE_SUBJECTS_FILE):
+    # SACE list plus any other names the catalog's Recommended Stage 2
+    # Subjects lists use (e.g. "Health Studies")
+    vocabulary = SubjectVocabulary(load_sace_subjects(path))
+    if df is None:
+        return vocabulary
+    extra = {}
+    for text in df['Recommended Stage 2 Subjects'].dropna():
+        spelled = {normalize(item).strip(' -"'): item.strip(' "') for item in text.split(',')}
+        for item in vocabulary.pattern.sub(',', normalize(text)).split(','):
+            item = item.strip(' -"')
+            if item in spelled and not item.startswith('and '):
+                extra.setdefault(item, spelled[item])
+    return SubjectVocabulary(vocabulary.names + list(extra.values()))
+
+
+class SubjectIndex:
+    # Prerequisites parsed once per distinct requirement string into clause
+    # groups; eligibility checks each group's clauses against the chosen
+    # subjects and maps the answer back to degrees. Ranking uses subject ->
+    # row positions for the assumed knowledge and recommended columns.
+
+    def __init__(self, df, vocabulary):
+        self.vocabulary = vocabulary
+        self.size = len(df)
+        self.rows = {}
+        for column in RANKED_COLUMNS:
+            # Requirement strings repeat a lot; parse each distinct one once
+            codes, texts = pd.factorize(df[column].reset_index(drop=True))
+            parsed = pd.Series([vocabulary.extract(text) for text in texts] + [[]], dtype=object)
+            self.rows[column] = self._rows(pd.Series(parsed.to_numpy()[codes]))
+
+        # Each degree's group of parsed prerequisite clauses: far fewer distinct
+        # requirements than degrees, each checked once per query
+        codes, texts = pd.factorize(df['Prerequisite'].reset_index(drop=True))
+        clauses = [parse_prerequisite(text, vocabulary) for text in texts] + [()]
+        groups, distinct = pd.factorize(pd.Series(clauses, dtype=object))
+        self.prerequisite_clauses = list(distinct)
+        self.prerequisite_group = groups[codes]
+        self.atar = pd.to_numeric(df['Guaranteed ATAR score'], errors='coerce').to_numpy(dtype=float)
+        # Tie-break order for match(): highest guaranteed ATAR first, unpublished last
+        self.atar_order = np.lexsort((np.arange(self.size), -np.nan_to_num(self.atar, nan=-1.0)))
+
+    def _rows(self, subjects):
+        exploded = subjects.explode().dropna()
+        positions = pd.Series(exploded.index.to_numpy()).groupby(exploded.to_numpy())
+        return {name: rows.to_numpy() for name, rows in positions}
+
+    def eligible(self, subjects, atar=None):
+        # Packed bitset of degrees whose prerequisites the subjects satisfy and
+        # whose guaranteed ATAR (when published) is within reach
+        subjects = set(subjects)
+        met = np.array([satisfies(clauses, subjects) for clauses in self.prerequisite_clauses], dtype=bool)
+        result = np.packbits(met[self.prerequisite_group])
+        if atar is not None:
+            within = np.packbits(~(self.atar > atar))  # NaN (no published ATAR) stays eligible
+            result = np.bitwise_and(result, within)
+        return result
+
+    def match(self, subjects, atar=None):
+        # Eligible row positions ranked by matched assumed knowledge and
+        # recommended subjects, then by the highest guaranteed ATAR reached
+        eligible = np.unpackbits(self.eligible(subjects, atar), count=self.size).astype(bool)
+        rows = self.atar_order[eligible[self.atar_order]]
+        hits, weights = [np.array([], dtype=np.int64)], [np.array([], dtype=np.int64)]
+        for column, weight in RANKED_COLUMNS.items():
+            for subject in subjects:
+                if subject in self.rows[column]:
+                    hits.append(self.rows[column][subject])
+                    weights.append(np.full(len(hits[-1]), weight))
+        score = np.bincount(np.concatenate(hits), np.concatenate(weights), minlength=self.size)
+        # rows are already in ATAR order; a stable sort on the small integer
+        # score keeps it within equal scores
+        order = np.argsort(-score[rows].astype(np.int16), kind='stable')
+        return rows[order], score[rows[order]]
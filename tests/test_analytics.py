@@ -0,0 +1,51 @@
+import csv
+
+from analytics import load_rollup, run_rollup
+from usage_log import FEEDBACK_FIELDS, LOG_FIELDS
+
+
+def write_log(path, fields, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        if mode == "w":
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def usage(day, num_results=3):
+    return {"timestamp": f"2026-03-{day:02d}T10:00:00", "selected_field": "Law", "num_results": num_results}
+
+
+def downloads(rollup):
+    return {day: totals['downloads'] for day, totals in rollup['days'].items()}
+
+
+def run(tmp_path):
+    rollup_path = tmp_path / "rollup.json"
+    run_rollup(str(rollup_path), [str(tmp_path / "usage.csv")], [str(tmp_path / "feedback.csv")])
+    return load_rollup(str(rollup_path))
+
+
+def test_appended_rows_are_counted_once(tmp_path):
+    write_log(tmp_path / "usage.csv", LOG_FIELDS, [usage(1), usage(1), usage(2, 0)])
+    write_log(tmp_path / "feedback.csv", FEEDBACK_FIELDS, [{"timestamp": "2026-03-01T11:00:00", "rating": 4}])
+    assert downloads(run(tmp_path)) == {"2026-03-01": 2, "2026-03-02": 1}
+
+    write_log(tmp_path / "usage.csv", LOG_FIELDS, [usage(2)], mode="a")
+    rollup = run(tmp_path)
+    assert downloads(rollup) == {"2026-03-01": 2, "2026-03-02": 2}
+    assert rollup['days']["2026-03-02"]['zero_results'] == 1
+    assert rollup['days']["2026-03-01"]['ratings']['4'] == 1
+
+
+def test_a_replaced_log_is_recounted_not_added_again(tmp_path):
+    write_log(tmp_path / "usage.csv", LOG_FIELDS, [usage(1), usage(1), usage(2), usage(2)])
+    write_log(tmp_path / "feedback.csv", FEEDBACK_FIELDS, [{"timestamp": "2026-03-01T11:00:00", "rating": 5}])
+    run(tmp_path)
+
+    # Rewritten shorter, keeping some rows that were already counted
+    write_log(tmp_path / "usage.csv", LOG_FIELDS, [usage(2), usage(3)])
+    rollup = run(tmp_path)
+    assert downloads(rollup) == {"2026-03-01": 0, "2026-03-02": 1, "2026-03-03": 1}
+    # Only the replaced log's totals were recounted
+    assert rollup['days']["2026-03-01"]['feedback'] == 1
@@ -0,0 +1,29 @@
+from benchmarks.synthetic import synthetic_catalog, write_sources
+from catalog_watcher import CatalogWatcher
+
+
+def test_indexes_are_built_before_the_swap(tmp_path):
+    write_sources(synthetic_catalog(30, seed=1), tmp_path)
+    builds = []
+    watchers = []
+
+    def build(df):
+        # Whether the frame being indexed was already being served
+        builds.append(bool(watchers) and watchers[0].current() is df)
+        return len(df)
+
+    watcher = CatalogWatcher(str(tmp_path / "catalog.arrow"), str(tmp_path), interval=3600,
+                             settle_seconds=0, indexers={'size': build})
+    watchers.append(watcher)
+    try:
+        old_version = watcher.version
+        assert watcher.indexes(old_version) == {'size': 30}
+
+        write_sources(synthetic_catalog(40, seed=2), tmp_path)
+        assert watcher.check()
+        assert builds == [False, False]
+        assert watcher.indexes(watcher.version) == {'size': 40}
+        # A run that read the old frame just before the swap still finds its indexes
+        assert watcher.indexes(old_version) == {'size': 30}
+    finally:
+        watcher.close()
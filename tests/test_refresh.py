@@ -0,0 +1,119 @@
+from collections import Counter
+
+import pandas as pd
+
+from benchmarks.fixture_site import fixture_site
+from benchmarks.synthetic import synthetic_catalog
+from catalog import make_shard, read_catalog
+from uni_functions import HttpFirstFetcher, refresh, refresh_shard, scrape_to_file
+
+DEGREES = 20
+
+
+class BlankListingFetcher(HttpFirstFetcher):
+    # Serves every study-area listing as a page without degree cards
+    def fetch(self, url, expect=None):
+        if "/study-areas/" in url:
+            return "<html><body>Down for maintenance</body></html>"
+        return super().fetch(url, expect)
+
+
+def run_refresh(tmp_path, listing_url, fetcher_class=HttpFirstFetcher):
+    study_areas = {listing_url: "XY_field.csv"}
+    with fetcher_class(4) as fetcher:
+        stats = refresh(study_areas, workers=4, output_dir=str(tmp_path), pool=fetcher,
+                        cache_path=str(tmp_path / "cache.json"), all_degrees_file="XY_all.csv",
+                        all_areas=study_areas)
+    return stats, fetcher.stats
+
+
+def degree_hits(hits):
+    return sum(count for path, count in hits.items() if path.startswith("/degrees/"))
+
+
+def test_changed_pages_are_parsed_from_the_checked_body(tmp_path):
+    hits = Counter()
+    with fixture_site(synthetic_catalog(DEGREES, seed=3), hits=hits) as (listing_url, _):
+        stats, fetch_paths = run_refresh(tmp_path, listing_url)
+
+    assert degree_hits(hits) == DEGREES
+    assert stats['parsed'] == DEGREES
+    assert fetch_paths['browser'] == 0
+    assert len(pd.read_csv(tmp_path / "XY_all.csv")) == DEGREES
+
+
+def test_unchanged_pages_are_not_parsed_again(tmp_path):
+    with fixture_site(synthetic_catalog(DEGREES, seed=3)) as (listing_url, _):
+        run_refresh(tmp_path, listing_url)
+        stats, _ = run_refresh(tmp_path, listing_url)
+
+    assert stats['checked'] == DEGREES
+    assert stats['not_modified'] == DEGREES
+    assert stats['parsed'] == 0
+
+
+def test_a_failing_page_does_not_abort_the_refresh(tmp_path):
+    catalog = synthetic_catalog(DEGREES, seed=3)
+    broken = {4, 9}
+    with fixture_site(catalog, broken=broken) as (listing_url, links):
+        stats, _ = run_refresh(tmp_path, listing_url)
+
+        assert stats['failed'] == 2
+        assert set(stats['failures']) == {links[4][1], links[9][1]}
+        assert stats['parsed'] == DEGREES - 2
+        written = pd.read_csv(tmp_path / "XY_all.csv")
+        assert len(written) == DEGREES - 2
+        assert links[4][1] not in set(written['Degree URL'])
+
+        # The failed pages were not cached, so the next run picks them up
+        broken.clear()
+        stats, _ = run_refresh(tmp_path, listing_url)
+    assert stats['failed'] == 0
+    assert stats['parsed'] == 2
+    assert len(pd.read_csv(tmp_path / "XY_all.csv")) == DEGREES
+
+
+def test_an_empty_listing_keeps_the_existing_rows(tmp_path):
+    with fixture_site(synthetic_catalog(DEGREES, seed=3)) as (listing_url, _):
+        run_refresh(tmp_path, listing_url)
+        stats, _ = run_refresh(tmp_path, listing_url, BlankListingFetcher)
+
+    assert stats['failed'] == 1
+    assert set(stats['failures']) == {listing_url}
+    assert len(pd.read_csv(tmp_path / "XY_field.csv")) == DEGREES
+    assert len(pd.read_csv(tmp_path / "XY_all.csv")) == DEGREES
+
+
+def test_a_shard_without_a_subjects_file_refreshes_and_prunes(tmp_path):
+    # A non-AU shard: one configured study area, no recommended subjects CSV
+    catalog = synthetic_catalog(DEGREES, seed=3)
+    for listed in (catalog, catalog.iloc[:12]):
+        with fixture_site(listed) as (listing_url, _):
+            shard = make_shard("VU", 2027, "Victoria University", {"VU_science_degrees_2027.csv": "Science"},
+                               str(tmp_path), {listing_url: "VU_science_degrees_2027.csv"})
+            with HttpFirstFetcher(4) as fetcher:
+                refresh_shard(shard, workers=4, pool=fetcher)
+
+        assert len(pd.read_csv(tmp_path / shard['all_degrees_file'])) == len(listed)
+        built = read_catalog(shard['catalog_file'])
+        assert len(built) == len(listed)
+        assert (built['Recommended Stage 2 Subjects'] == '').all()
+
+
+def test_scrape_resumes_after_a_half_written_row(tmp_path):
+    output = tmp_path / "XY_field.csv"
+    hits = Counter()
+    with fixture_site(synthetic_catalog(DEGREES, seed=3), hits=hits) as (_, links):
+        with HttpFirstFetcher(4) as fetcher:
+            scrape_to_file(links[:5], str(output), pool=fetcher)
+            # As left by a crash: five complete rows, then part of a sixth
+            with open(output, "a", encoding="utf-8") as f:
+                f.write(f"{links[5][0]},{links[5][1]},Ful")
+            output.rename(f"{output}.partial")
+            hits.clear()
+            written = scrape_to_file(links, str(output), pool=fetcher)
+
+    assert written == DEGREES
+    assert degree_hits(hits) == DEGREES - 5
+    result = pd.read_csv(output)
+    assert sorted(result['Degree URL']) == sorted(url for _, url in links)
@@ -0,0 +1,47 @@
+import numpy as np
+
+from benchmarks.bench_search import QUERIES
+from benchmarks.synthetic import synthetic_catalog
+from search_index import SearchIndex
+
+
+def test_within_matches_filtering_the_ranked_hits():
+    df = synthetic_catalog(3000)
+    index = SearchIndex(df)
+    keep = np.random.default_rng(0).random(len(df)) < 0.3
+    for query in QUERIES:
+        hits = index.search(query)
+        expected = hits[keep[hits]]
+        assert np.array_equal(index.search(query, within=np.packbits(keep)), expected)
+        assert np.array_equal(index.search(query, limit=7, within=np.packbits(keep)), expected[:7])
+
+
+def test_limit_keeps_the_ranked_prefix():
+    index = SearchIndex(synthetic_catalog(3000))
+    for query in QUERIES:
+        for limit in (1, 50):
+            assert np.array_equal(index.search(query, limit=limit), index.search(query)[:limit])
+
+
+def test_mask_holds_every_hit():
+    df = synthetic_catalog(3000)
+    index = SearchIndex(df)
+    for query in QUERIES:
+        mask = np.unpackbits(index.mask(query), count=len(df))
+        assert np.array_equal(np.flatnonzero(mask), np.sort(index.search(query)))
+
+
+def test_every_term_must_match():
+    index = SearchIndex(synthetic_catalog(3000))
+    for query in ['computer science', 'chemistry methods', 'sustainable urban design']:
+        expected = set.intersection(*(set(index.search(term)) for term in query.split()))
+        assert set(index.search(query)) == expected
+
+
+def test_url_boilerplate_is_not_indexed():
+    df = synthetic_catalog(3000)
+    index = SearchIndex(df)
+    for token in ['https', 'edu', 'study', 'dom']:
+        assert token not in index.postings
+    assert len(index.search('https')) == 0
+    assert len(index.search('degrees')) == 0
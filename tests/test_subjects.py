@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from subjects import SubjectIndex, SubjectVocabulary, parse_prerequisite
+
+# Prerequisite strings as they appear in AU_all_degrees_2026.csv
+METHODS = 'SACE Stage 2 Mathematical Methods (or equivalent)'
+SCIENCE = 'SACE Stage 2 Biology, Chemistry or Physics (or equivalent)'
+DENTAL = ('Any one of SACE Stage 2 Chemistry, Mathematical Methods, Specialist Mathematics, or Physics '
+          '(or equivalent); PLUS Any one additional subject chosen from SACE Stage 2 Biology, '
+          'Earth and Environmental Science, Chemistry, or Physics (or equivalent).')
+EITHER = 'Any one of SACE Stage 2 Biology or Chemistry or Mathematical Methods (or equivalent).'
+LEARNING_AREA = 'Any 20-credit SACE Stage 2 Tertiary Admission Subject from the Mathematics or Science Learning Areas.'
+
+VOCABULARY = SubjectVocabulary([
+    'Biology', 'Chemistry', 'Earth and Environmental Science', 'English', 'Mathematical Methods',
+    'Physics', 'Specialist Mathematics',
+])
+DEGREES = {
+    'Bachelor of Engineering': METHODS,
+    'Bachelor of Science': SCIENCE,
+    'Bachelor of Dental Surgery': DENTAL,
+    'Bachelor of Health Science': EITHER,
+    'Bachelor of Mathematical Sciences': LEARNING_AREA,
+    'Bachelor of Arts': None,
+}
+
+
+def eligible_degrees(subjects):
+    df = pd.DataFrame({
+        'Degree Name': list(DEGREES),
+        'Prerequisite': list(DEGREES.values()),
+        'Assumed knowledge': None,
+        'Recommended Stage 2 Subjects': None,
+        'Guaranteed ATAR score': None,
+    })
+    index = SubjectIndex(df, VOCABULARY)
+    rows = np.flatnonzero(np.unpackbits(index.eligible(subjects), count=len(df)))
+    return set(df['Degree Name'].iloc[rows])
+
+
+def test_or_equivalent_is_not_an_alternative():
+    assert parse_prerequisite(METHODS, VOCABULARY) == ((False, ('Mathematical Methods',)),)
+    assert parse_prerequisite(SCIENCE, VOCABULARY) == ((True, ('Biology', 'Chemistry', 'Physics')),)
+
+
+def test_plus_splits_clauses():
+    assert parse_prerequisite(DENTAL, VOCABULARY) == (
+        (True, ('Chemistry', 'Mathematical Methods', 'Specialist Mathematics', 'Physics')),
+        (True, ('Biology', 'Earth and Environmental Science', 'Chemistry', 'Physics')),
+    )
+
+
+def test_every_clause_must_be_met():
+    assert 'Bachelor of Dental Surgery' not in eligible_degrees(['Earth and Environmental Science'])
+    assert 'Bachelor of Dental Surgery' not in eligible_degrees(['Mathematical Methods'])
+    assert 'Bachelor of Dental Surgery' in eligible_degrees(['Mathematical Methods', 'Earth and Environmental Science'])
+
+
+def test_additional_subject_must_differ():
+    assert 'Bachelor of Dental Surgery' not in eligible_degrees(['Chemistry'])
+    assert 'Bachelor of Dental Surgery' in eligible_degrees(['Chemistry', 'Physics'])
+
+
+def test_single_and_alternative_prerequisites():
+    assert eligible_degrees([]) == {'Bachelor of Mathematical Sciences', 'Bachelor of Arts'}
+    assert eligible_degrees(['Mathematical Methods']) == {
+        'Bachelor of Engineering', 'Bachelor of Health Science', 'Bachelor of Mathematical Sciences', 'Bachelor of Arts',
+    }
+    assert eligible_degrees(['Physics']) == {'Bachelor of Science', 'Bachelor of Mathematical Sciences', 'Bachelor of Arts'}
@@ -0,0 +1,168 @@
+import time
+
+import timing
+from usage_log import HEADER, UsageLogger
+
+
+class FakeSheet:
+    # Stand-in for a gspread worksheet; fail_next makes the next appends raise
+
+    def __init__(self, rows=None):
+        self.rows = [list(row) for row in rows or []]
+        self.append_calls = []
+        self.attempts = 0
+        self.header_reads = 0
+        self.fail_next = 0
+        self.fail_header = 0
+
+    def row_values(self, index):
+        self.header_reads += 1
+        if self.fail_header:
+            self.fail_header -= 1
+            raise RuntimeError("APIError: [503]: Service unavailable")
+        return self.rows[index - 1] if len(self.rows) >= index else []
+
+    def delete_rows(self, index):
+        if len(self.rows) >= index:
+            del self.rows[index - 1]
+
+    def insert_row(self, values, index=1):
+        self.rows.insert(index - 1, list(values))
+
+    def append_rows(self, values, value_input_option=None):
+        self.attempts += 1
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("APIError: [429]: Quota exceeded")
+        self.append_calls.append(len(values))
+        self.rows.extend(list(row) for row in values)
+
+    def append_row(self, values, value_input_option=None):
+        self.append_rows([values], value_input_option)
+
+
+def event(i):
+    return {"timestamp": f"2026-01-01T00:00:{i:02d}", "selected_field": "Law", "num_results": i}
+
+
+def make_logger(tmp_path, sheet, **kwargs):
+    kwargs.setdefault("flush_interval", 60.0)
+    return UsageLogger(sheet, wal_path=str(tmp_path / "wal.csv"), **kwargs)
+
+
+def test_rows_are_sent_in_batches(tmp_path):
+    sheet = FakeSheet()
+    logger = make_logger(tmp_path, sheet, batch_size=3)
+    for i in range(7):
+        logger.log(event(i))
+    assert logger.flush(5.0)
+    logger.close(5.0)
+
+    assert sheet.append_calls == [3, 3, 1]
+    assert sheet.rows[0] == HEADER
+    assert [row[0] for row in sheet.rows[1:]] == [event(i)["timestamp"] for i in range(7)]
+
+
+def test_failed_flush_waits_for_the_backoff(tmp_path):
+    sheet = FakeSheet()
+    sheet.fail_next = 1000
+    logger = make_logger(tmp_path, sheet, batch_size=5, initial_backoff=10.0)
+    for i in range(40):
+        logger.log(event(i))
+        time.sleep(0.01)
+    time.sleep(0.2)
+
+    # One attempt when the first batch filled up, then nothing until the
+    # 10 s backoff runs out, however many rows arrive meanwhile
+    assert sheet.attempts == 1
+    assert logger.failed_flushes == 1
+    logger.close(5.0)
+
+
+def test_backoff_grows_and_recovers(tmp_path):
+    sheet = FakeSheet()
+    sheet.fail_next = 2
+    logger = make_logger(tmp_path, sheet, batch_size=1, initial_backoff=0.05)
+    logger.log(event(0))
+    assert logger.flush(5.0)
+    logger.close(5.0)
+
+    assert sheet.attempts == 3
+    assert sheet.append_calls == [1]
+    assert logger.failed_flushes == 2
+
+
+def test_unsent_rows_are_replayed_after_a_restart(tmp_path):
+    sheet = FakeSheet()
+    logger = make_logger(tmp_path, sheet, batch_size=2)
+    logger.log(event(0))
+    logger.log(event(1))
+    assert logger.flush(5.0)
+    logger.close(5.0)
+
+    # No sheet: rows stay in the WAL past the recorded offset
+    offline = make_logger(tmp_path, None, batch_size=2)
+    offline.log(event(2))
+    offline.log(event(3))
+    offline.close(5.0)
+    with open(tmp_path / "wal.csv.offset") as f:
+        assert f.read() == "2"
+
+    restarted = make_logger(tmp_path, sheet, batch_size=2)
+    assert restarted.flush(5.0)
+    restarted.close(5.0)
+    assert [row[0] for row in sheet.rows[1:]] == [event(i)["timestamp"] for i in range(4)]
+    with open(tmp_path / "wal.csv.offset") as f:
+        assert f.read() == "4"
+
+    # Everything is acknowledged; another restart sends nothing
+    again = make_logger(tmp_path, sheet, batch_size=2)
+    assert again.flush(5.0)
+    again.close(5.0)
+    assert sheet.append_calls == [2, 2]
+
+
+def test_header_is_checked_once(tmp_path):
+    sheet = FakeSheet([["Old", "Header"]])
+    logger = make_logger(tmp_path, sheet, batch_size=1)
+    for i in range(3):
+        logger.log(event(i))
+        assert logger.flush(5.0)
+    logger.close(5.0)
+
+    assert sheet.header_reads == 1
+    assert sheet.rows[0] == HEADER
+    assert len(sheet.rows) == 4
+
+
+def test_header_check_is_retried_after_an_error(tmp_path):
+    sheet = FakeSheet()
+    sheet.fail_header = 1
+    logger = make_logger(tmp_path, sheet, batch_size=1)
+    for i in range(3):
+        logger.log(event(i))
+        assert logger.flush(5.0)
+    logger.close(5.0)
+
+    assert sheet.header_reads == 2
+    assert sheet.rows[0] == HEADER
+
+
+def test_sheets_calls_are_timed(tmp_path):
+    enabled = timing.ENABLED
+    timing.enable()
+    timing.reset()
+    try:
+        sheet = FakeSheet()
+        logger = make_logger(tmp_path, sheet, batch_size=2)
+        for i in range(4):
+            logger.log(event(i))
+        assert logger.flush(5.0)
+        logger.close(5.0)
+        stages = timing.snapshot()
+    finally:
+        timing.enable(enabled)
+        timing.reset()
+
+    assert stages['sheets.header']['count'] == 1
+    assert stages['sheets.append']['count'] == 2
@@ -0,0 +1,174 @@
+import bisect
+import functools
+import os
+import threading
+import time
+
+# Off unless DEGREE_TIMING=1; span() and @timed then cost one flag check
+ENABLED = os.environ.get("DEGREE_TIMING", "") == "1"
+
+METRIC_NAME = "degree_dashboard_stage_seconds"
+# Upper bounds in seconds, ~2.5x apart from 0.1ms to 60s
+BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+
+class Histogram:
+    # Fixed buckets, so recording is O(log buckets) and memory stays constant;
+    # percentiles are interpolated within the bucket they fall in
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                low = BUCKETS[i - 1] if i else 0.0
+                high = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(low + (high - low) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def enable(enabled=True):
+    global ENABLED
+    ENABLED = enabled
+
+
+def record(stage, seconds):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = Histogram()
+        histogram.record(seconds)
+
+
+class _Span:
+    __slots__ = ('stage', 'started')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.started)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(stage):
+    # with span('filter'): ...  -- recorded even when the block raises
+    return _Span(stage) if ENABLED else _NULL_SPAN
+
+
+def timed(stage):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with _Span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    # Stage -> {'count', 'sum', 'p50', 'p95', 'p99', 'max'}, times in ms
+    with _lock:
+        return {
+            stage: {
+                'count': h.count,
+                'sum': round(h.sum * 1e3, 3),
+                'p50': round(h.percentile(50) * 1e3, 3),
+                'p95': round(h.percentile(95) * 1e3, 3),
+                'p99': round(h.percentile(99) * 1e3, 3),
+                'max': round(h.max * 1e3, 3),
+            }
+            for stage, h in sorted(_histograms.items())
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def prometheus_text():
+    # Prometheus text exposition format (cumulative histogram buckets)
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent per dashboard and scrape stage.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    with _lock:
+        for stage, h in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ['+Inf'], h.counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {h.sum:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {h.count}')
+    return "\n".join(lines) + "\n"
+
+
+def summary_line():
+    return "timing " + " ".join(
+        f"{stage}=n{s['count']}/p50:{s['p50']}ms/p95:{s['p95']}ms" for stage, s in snapshot().items()
+    )
+
+
+def report():
+    # One summary line, only when something was recorded
+    if _histograms:
+        print(summary_line())
+
+
+def start_reporter(interval=60.0, textfile=None):
+    # Prints a summary line every interval and, if textfile is given, rewrites
+    # it for a node_exporter textfile collector (temp file + rename)
+    def run():
+        while True:
+            time.sleep(interval)
+            if not _histograms:
+                continue
+            report()
+            if textfile:
+                tmp_path = f"{textfile}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(prometheus_text())
+                os.replace(tmp_path, textfile)
+
+    thread = threading.Thread(target=run, name="timing-reporter", daemon=True)
+    thread.start()
+    return thread
@@ -1,43 +1,219 @@
 
+import csv
+import functools
+import glob
+import heapq
+import importlib.util
+import itertools
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urljoin
+
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup as BS
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-import time
-import re
+from catalog import DEFAULT_SHARD, build_catalog, field_files, file_sha256
+from page_cache import PAGE_CACHE_FILE, PageCache, content_hash
+from timing import report, span, timed
+
+# lxml is optional and left out of requirements.txt, which only covers the
+# dashboard: `pip install lxml` makes page parsing several times faster,
+# otherwise the stdlib html.parser is used
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Fixed schema of the cleaned per-field CSVs
+OUTPUT_COLUMNS = ['Degree Name', 'Guaranteed ATAR score', 'Prerequisite', 'Assumed knowledge', 'Mode', 'Campus', 'Study as', 'Duration', 'Start date', 'Degree URL']
+COLUMNS_TO_DROP = ['Check your eligibility', 'Program code', 'Indicative annual fees', 'Time commitment']
+ATAR_PATTERN = r'(\d+\.?\d*)$'  # Match integers and decimals
+
+# Class names that must be present before server-rendered HTML is trusted
+LISTING_MARKER = "degree-card-title-container-row"
+DEGREE_MARKER = "degree-details-content-section-icon-list-top"
+
+STUDY_AREA_URL = "https://adelaideuni.edu.au/study/study-areas/{}/"
+
+# Study-area listing page -> per-field output file (see catalog.field_files)
+STUDY_AREAS = {
+    STUDY_AREA_URL.format('accounting-commerce-economics'): 'AU_accounting_commerce_ecconomics_degrees_2026.csv',
+    STUDY_AREA_URL.format('agriculture-animal-veterinary-science'): 'AU_agriculture_animal_veterinary-science_degrees_2026.csv',
+    STUDY_AREA_URL.format('allied-health'): 'AU_allied-health_degrees_2026.csv',
+    STUDY_AREA_URL.format('architecture-design'): 'AU_architecture-design_degrees_2026.csv',
+    STUDY_AREA_URL.format('arts-humanities-social-sciences'): 'AU_arts_humanities_social-sciences_degrees_2026.csv',
+    STUDY_AREA_URL.format('aviation'): 'AU_aviation_degrees_2026.csv',
+    STUDY_AREA_URL.format('business-marketing-management'): 'AU_business_marketing_management_degrees_2026.csv',
+    STUDY_AREA_URL.format('computer-science-information-technology'): 'AU_computer-science_information-technology_degrees_2026.csv',
+    STUDY_AREA_URL.format('creative-media-communication'): 'AU_creative_media_communication_degrees_2026.csv',
+    STUDY_AREA_URL.format('engineering'): 'AU_engineering_degrees_2026.csv',
+    STUDY_AREA_URL.format('health-biomedical-sciences'): 'AU_health_biomedical-sciences_degrees_2026.csv',
+    STUDY_AREA_URL.format('law-and-justice'): 'AU_law_justice_degrees_2026.csv',
+    STUDY_AREA_URL.format('mathematics-data-science'): 'AU_mathematics_data-science_degrees_2026.csv',
+    STUDY_AREA_URL.format('medicine-dentistry-oral-health'): 'AU_medicine_dentistry_oral-health_degrees_2026.csv',
+    STUDY_AREA_URL.format('music'): 'AU_music_degrees_2026.csv',
+    STUDY_AREA_URL.format('nursing-midwifery'): 'AU_nursing_midwifery_degrees_2026.csv',
+    STUDY_AREA_URL.format('nutrition-food-science'): 'AU_nutrition_food-science_degrees_2026.csv',
+    STUDY_AREA_URL.format('property-construction-real-estate'): 'AU_property_construction_real-estate_degrees_2026.csv',
+    STUDY_AREA_URL.format('psychology-social-work'): 'AU_psychology_social-work_degrees_2026.csv',
+    STUDY_AREA_URL.format('science-environment-sustainability'): 'AU_science_environment_sustainability_degrees_2026.csv',
+    STUDY_AREA_URL.format('teaching-education'): 'AU_teaching_education_degrees_2026.csv',
+    STUDY_AREA_URL.format('tourism-sport-events'): 'AU_tourism_sports_events_degrees_2026.csv',
+}
+
 
-def set_up(url):
+@functools.lru_cache(maxsize=None)
+def _chromedriver_path():
+    # Resolve/download chromedriver once per process instead of once per page
+    return ChromeDriverManager().install()
+
+def new_driver():
     options = Options()
     options.add_argument("--headless")  # Run in background, no browser window
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.get(url)
+    return webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
 
-    html = driver.page_source
-    soup = BS(html, "html.parser")
-    
-    degree_cards = soup.find_all("div", class_="degree-card-title-container-row-title")
+
+class DriverPool:
+    # Bounded set of reusable browsers shared by the crawl workers
+
+    def __init__(self, size=4, factory=new_driver):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        while True:
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                pass
+            with self._lock:
+                if len(self._all) < self.size:
+                    driver = self.factory()
+                    self._all.append(driver)
+                    return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self):
+        driver = self._acquire()
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            # A crashed browser is replaced rather than handed to the next worker
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._idle.put(driver)
+            else:
+                self._discard(driver)
+
+    @timed('scrape.fetch_browser')
+    def fetch(self, url, expect=None):
+        with self.driver() as driver:
+            driver.get(url)
+            return driver.page_source
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HttpFirstFetcher:
+    # Fetches pages over a pooled requests session and only falls back to a
+    # headless browser (started on first need) when the expected markup is
+    # missing from the server-rendered HTML
+
+    def __init__(self, workers=4, session=None, driver_pool=None):
+        self.workers = workers
+        self.session = session or new_session(workers)
+        self.stats = Counter()
+        self._driver_pool = driver_pool
+        self._lock = threading.Lock()
+
+    @property
+    def driver_pool(self):
+        with self._lock:
+            if self._driver_pool is None:
+                self._driver_pool = DriverPool(self.workers)
+            return self._driver_pool
+
+    def fetch(self, url, expect=None):
+        try:
+            with span('scrape.fetch_http'):
+                response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            if expect is None or expect in response.text:
+                self._count('http')
+                return response.text
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}, using browser: {e}")
+        return self.render(url)
+
+    def render(self, url):
+        # Browser only, for pages whose server HTML is already known to lack the markup
+        self._count('browser')
+        return self.driver_pool.fetch(url)
+
+    def _count(self, path):
+        with self._lock:
+            self.stats[path] += 1
+
+    def close(self):
+        self.session.close()
+        if self._driver_pool is not None:
+            self._driver_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@timed('scrape.parse_listing')
+def parse_listing(html, base_url=""):
+    soup = BS(html, HTML_PARSER)
 
     bachelor_degrees = []
-    
-    for card in degree_cards:
+    for card in soup.find_all("div", class_="degree-card-title-container-row-title"):
         title = card.get_text(strip=True)
-    
+
         if title.startswith('Bachelor'):
             bachelor_degrees.append(title)
 
-    return bachelor_degrees
-
-def ba_links(url):
-    options = Options()
-    options.add_argument("--headless")  # Run in background, no browser window
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.get(url)
-    html = driver.page_source
-    soup = BS(html, "html.parser")
-    
     ba_degree_links = []
     degree_anchors = soup.find_all("a", class_="degree-card-title-container-row")
 
@@ -47,51 +223,372 @@ def ba_links(url):
         href = anchor.get("href")
 
         if href and title.startswith("Bachelor"):
-            full_url = href
+            full_url = urljoin(base_url, href)
             ba_degree_links.append((title, full_url))
 
+    return bachelor_degrees, ba_degree_links
+
+@timed('scrape.parse_degree')
+def parse_degree(html, degree):
+    page_soup = BS(html, HTML_PARSER)
+    records = []
+
+    block1 = page_soup.find_all("div", class_="degree-details-content-section-icon-list-top")
+
+    for i in block1:
+        spans = i.find_all('span')
+
+        if spans: # shorthand for if len(spans) > 0:
+            name = spans[0].get_text(strip=True)
+            if name == 'Entry scores':
+                value = spans[-2].get_text(strip=True)
+            else:
+                value = spans[-1].get_text(strip=True)
+
+            records.append({
+                "Degree Name": degree[0],    # Degree name from ba_degree_links
+                "Degree URL": degree[1],     # Degree link from ba_degree_links
+                "Field": name,               # Field name e.g. "Mode"
+                "Value": value               # Field value e.g. "100% Online"
+            })
+
+    return records
+
+
+# pool is anything with fetch(url, expect): an HttpFirstFetcher (default)
+# or a DriverPool to force every page through the browser
+
+def set_up(url, pool=None):
+    with HttpFirstFetcher(1) if pool is None else nullcontext(pool) as pool:
+        bachelor_degrees, _ = parse_listing(pool.fetch(url, LISTING_MARKER), url)
+    return bachelor_degrees
+
+def ba_links(url, pool=None):
+    with HttpFirstFetcher(1) if pool is None else nullcontext(pool) as pool:
+        _, ba_degree_links = parse_listing(pool.fetch(url, LISTING_MARKER), url)
     return ba_degree_links
 
+def crawl_listing(url, pool):
+    # One page load gives both the titles (set_up) and links (ba_links)
+    return parse_listing(pool.fetch(url, LISTING_MARKER), url)
 
-def get_data(degree_links):
-    all_data = []
 
-    options = Options()
-    options.add_argument("--headless")  # Run in background, no browser window
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+def get_data(degree_links, pool=None, workers=1):
+    with HttpFirstFetcher(workers) if pool is None else nullcontext(pool) as pool:
+        if workers <= 1:
+            pages = [parse_degree(pool.fetch(url[1], DEGREE_MARKER), url) for url in degree_links]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = list(executor.map(lambda url: parse_degree(pool.fetch(url[1], DEGREE_MARKER), url), degree_links))
 
-    for url in degree_links:
-        
-        driver.get(url[1])
-        html = driver.page_source
-        page_soup = BS(html, "html.parser")
-    
-        block1 = page_soup.find_all("div", class_="degree-details-content-section-icon-list-top")
-    
-        for i in block1:
-            spans = i.find_all('span')
-            #print(spans)
-        
-            if spans: # shorthand for if len(spans) > 0:
-                name = spans[0].get_text(strip=True)
-                if name == 'Entry scores':
-                    value = spans[-2].get_text(strip=True)
-                else: 
-                    value = spans[-1].get_text(strip=True)
-    
-                all_data.append({
-                    "Degree Name": url[0],    # Degree name from ba_degree_links
-                    "Degree URL": url[1],     # Degree link from ba_degree_links
-                    "Field": name,            # Field name e.g. "Mode"
-                    "Value": value            # Field value e.g. "100% Online"
-                })
-    
+    all_data = [record for page in pages for record in page]
     data_list = pd.DataFrame(all_data)
-    
+
     return data_list
 
 
+def compare_fetch_paths(degree_links, workers=4):
+    # Scrape the same pages over plain HTTP and through the browser and
+    # return the (Degree URL, Field) cells where the two disagree
+    with HttpFirstFetcher(workers) as fetcher, DriverPool(workers) as pool:
+        fast = get_data(degree_links, pool=fetcher, workers=workers)
+        slow = get_data(degree_links, pool=pool, workers=workers)
+
+    key = ['Degree URL', 'Field']
+    merged = fast.merge(slow, on=key, how='outer', suffixes=(' (http)', ' (browser)'), indicator=True)
+    return merged[(merged['_merge'] != 'both') | (merged['Value (http)'] != merged['Value (browser)'])]
+
+
+def degree_record(degree, html):
+    # One wide row per degree page, equivalent to data_pivot + clean_up
+    fields = {}
+    for record in parse_degree(html, degree):
+        fields.setdefault(record['Field'], record['Value'])  # aggfunc='first'
+    if not fields:
+        return None
+    fields['Guaranteed ATAR score'] = fields.pop('Entry scores', None)
+    row = {column: fields.get(column) for column in OUTPUT_COLUMNS}
+    row['Degree Name'], row['Degree URL'] = degree
+    return row
+
+def iter_degree_records(degree_links, pool, workers=4, fetch=None):
+    # Yields records as pages finish; at most 2 * workers pages are in flight.
+    # fetch(degree) -> html overrides pool.fetch, e.g. to reuse a page body
+    # that was already downloaded.
+    def scrape(degree):
+        html = fetch(degree) if fetch is not None else pool.fetch(degree[1], DEGREE_MARKER)
+        return degree_record(degree, html) if html else None
+
+    degree_links = iter(degree_links)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while True:
+            for degree in itertools.islice(degree_links, 2 * workers - len(pending)):
+                pending.add(executor.submit(scrape, degree))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                if record is not None:
+                    yield record
+
+def iter_record_batches(records, batch_size=50):
+    # Typed DataFrames with the fixed schema; ATAR parsed per batch
+    for batch in iter(lambda: list(itertools.islice(records, batch_size)), []):
+        frame = pd.DataFrame(batch, columns=OUTPUT_COLUMNS)
+        frame['Guaranteed ATAR score'] = parse_atar_scores(frame['Guaranteed ATAR score'])
+        yield frame
+
+def _trim_partial(partial):
+    # A crash mid-write can leave half a row at the end of the .partial CSV;
+    # cut it back to the last complete line before reading or appending
+    with open(partial, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - (1 << 20)))
+        tail = f.read()
+        end = size - len(tail) + tail.rfind(b'\n') + 1
+        if end < size:
+            f.truncate(end)
+
+def _written_urls(partial, parquet):
+    if parquet:
+        if not glob.glob(os.path.join(partial, 'part-*.parquet')):
+            return set()
+        return set(pd.read_parquet(partial, columns=['Degree URL'])['Degree URL'])
+    if not os.path.exists(partial):
+        return set()
+    _trim_partial(partial)
+    if not os.path.getsize(partial):
+        os.remove(partial)
+        return set()
+    return set(pd.read_csv(partial, usecols=['Degree URL'])['Degree URL'])
+
+@timed('scrape.write_batch')
+def _append_batch(frame, partial, parquet):
+    if parquet:
+        os.makedirs(partial, exist_ok=True)
+        part = len(glob.glob(os.path.join(partial, 'part-*.parquet')))
+        path = os.path.join(partial, f"part-{part:05d}.parquet")
+        # Renamed into place so a crash never leaves a half-written part
+        frame.to_parquet(f"{path}.tmp", index=False)
+        os.replace(f"{path}.tmp", path)
+        return
+    header = not os.path.exists(partial)
+    with open(partial, 'a', newline='', encoding='utf-8') as f:
+        frame.to_csv(f, index=False, header=header)
+        f.flush()
+        os.fsync(f.fileno())
+
+def scrape_to_file(degree_links, output_file, pool=None, workers=4, batch_size=50):
+    # Streams cleaned rows into output_file.partial as batches complete and
+    # renames it to output_file at the end. After a crash the next call
+    # skips degrees already in the .partial file. A .parquet output_file
+    # is written as a directory of numbered part files.
+    partial = f"{output_file}.partial"
+    parquet = output_file.endswith('.parquet')
+
+    done_urls = _written_urls(partial, parquet)
+    remaining = [degree for degree in degree_links if degree[1] not in done_urls]
+
+    written = len(done_urls)
+    with HttpFirstFetcher(workers) if pool is None else nullcontext(pool) as pool:
+        records = iter_degree_records(remaining, pool, workers)
+        for frame in iter_record_batches(records, batch_size):
+            _append_batch(frame, partial, parquet)
+            written += len(frame)
+
+    if not written:
+        _append_batch(pd.DataFrame(columns=OUTPUT_COLUMNS), partial, parquet)
+    if parquet and os.path.isdir(output_file):
+        shutil.rmtree(output_file)
+    os.replace(partial, output_file)
+    return written
+
+
+def crawl(study_areas=None, workers=4, output_dir=".", pool=None):
+    # Scrape every study area with one shared fetcher and stream the cleaned
+    # per-field CSVs to disk; returns {file name: number of degrees}
+    study_areas = STUDY_AREAS if study_areas is None else study_areas
+    results = {}
+
+    with HttpFirstFetcher(workers) if pool is None else nullcontext(pool) as pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            listings = dict(zip(study_areas, executor.map(lambda url: crawl_listing(url, pool), study_areas)))
+
+        for url, file_name in study_areas.items():
+            _, ba_degree_links = listings[url]
+            if not ba_degree_links:
+                print(f"No degrees found at {url}")
+                continue
+            results[file_name] = scrape_to_file(ba_degree_links, os.path.join(output_dir, file_name), pool=pool, workers=workers)
+
+    report()
+    return results
+
+
+
+def new_session(pool_size=4):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@timed('scrape.check_page')
+def check_page(session, cache, url):
+    # Conditional GET against the cached validators. Returns (status,
+    # validators, html): status is 'not_modified' (304), 'unchanged' (same
+    # content hash), 'changed' or 'failed'; html is the body when one came back
+    # and the error message when the request failed.
+    try:
+        response = session.get(url, headers=cache.request_headers(url), timeout=30)
+        if response.status_code == 304:
+            return 'not_modified', None, None
+        response.raise_for_status()
+    except requests.RequestException as e:
+        return 'failed', None, str(e)
+
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': content_hash(response.content),
+    }
+    if cache.is_unchanged(url, validators['sha256']):
+        return 'unchanged', validators, response.text
+    return 'changed', validators, response.text
+
+@timed('scrape.upsert')
+def _upsert_rows(path, new_rows, keep_urls=None):
+    # Replace rows of path whose Degree URL appears in new_rows; with
+    # keep_urls, also drop degrees that are no longer listed
+    existing = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame(columns=new_rows.columns)
+    kept = existing[~existing['Degree URL'].isin(new_rows['Degree URL'])]
+    if keep_urls is not None:
+        kept = kept[kept['Degree URL'].isin(keep_urls)]
+    if new_rows.empty and len(kept) == len(existing):
+        return False
+
+    merged = pd.concat([kept, new_rows], ignore_index=True, sort=False)
+    merged = merged.sort_values(by='Degree Name').reset_index(drop=True)
+    save_file(merged, path)
+    return True
+
 
+def refresh(study_areas=None, workers=4, output_dir=".", pool=None,
+            cache_path=PAGE_CACHE_FILE, all_degrees_file="AU_all_degrees_2026.csv", all_areas=None):
+    # Incremental crawl: only degree pages whose HTTP validators or content
+    # hash changed are rendered, parsed and merged into the CSVs. all_areas is
+    # every study area of the catalog being refreshed (STUDY_AREAS for AU).
+    study_areas = STUDY_AREAS if study_areas is None else study_areas
+    all_areas = STUDY_AREAS if all_areas is None else all_areas
+    cache = PageCache(cache_path)
+    stats = Counter()
+    all_degrees_path = os.path.join(output_dir, all_degrees_file)
+    known_urls = set()
+    if os.path.exists(all_degrees_path):
+        known_urls = set(pd.read_csv(all_degrees_path, usecols=['Degree URL'])['Degree URL'])
+
+    with HttpFirstFetcher(workers) if pool is None else nullcontext(pool) as pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            listings = dict(zip(study_areas, executor.map(lambda url: crawl_listing(url, pool), study_areas)))
+            degrees = {link[1]: link for _, links in listings.values() for link in links}
+
+            # A listing with no degree cards (maintenance page, markup change)
+            # leaves that area's CSV alone rather than emptying it
+            failures = {}
+            for url, (_, links) in listings.items():
+                if not links:
+                    failures[url] = "no degrees listed"
+                    print(f"No degrees found at {url}")
+
+            session = getattr(pool, 'session', None) or new_session(workers)
+            checks = dict(zip(degrees, executor.map(lambda url: check_page(session, cache, url), degrees)))
+
+        # A failed page keeps its cache entry and CSV rows and is retried next run
+        for url, (status, validators, html) in checks.items():
+            stats['checked'] += 1
+            if status == 'failed':
+                failures[url] = html
+                print(f"Refresh: could not check {url}: {html}")
+            elif status == 'not_modified':
+                stats['not_modified'] += 1
+            else:
+                stats['fetched'] += 1
+                if status == 'unchanged':
+                    stats['not_modified'] += 1
+
+        # Changed pages are parsed from the body check_page already downloaded;
+        # the browser is only used when that body lacks the degree markup. A
+        # degree missing from the merged CSV has to be parsed even if its page
+        # is cached (a 304 has no body, so that one is fetched again).
+        render = getattr(pool, 'render', lambda url: pool.fetch(url, DEGREE_MARKER))
+
+        def page_html(degree):
+            _, _, html = checks[degree[1]]
+            try:
+                if html is None:
+                    return pool.fetch(degree[1], DEGREE_MARKER)
+                return html if DEGREE_MARKER in html else render(degree[1])
+            except Exception as e:
+                failures[degree[1]] = str(e)
+                print(f"Refresh: could not load {degree[1]}: {e}")
+                return None
+
+        changed = [degrees[url] for url, (status, _, _) in checks.items()
+                   if status != 'failed' and (status == 'changed' or url not in known_urls)]
+        batches = list(iter_record_batches(iter_degree_records(changed, pool, workers, fetch=page_html)))
+        new_rows = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=OUTPUT_COLUMNS)
+        stats['parsed'] = len(changed) - len(set(failures) & {degree[1] for degree in changed})
+        stats['failed'] = len(failures)
+        stats['failures'] = failures
+        for path, count in getattr(pool, 'stats', {}).items():
+            stats[f'{path}_pages'] = count
+
+    for url, (status, validators, _) in checks.items():
+        if validators is not None and url not in failures:
+            cache.put(url, **validators)
+    cache.save()
+
+    for url, file_name in study_areas.items():
+        if url in failures:
+            continue
+        listed_urls = {link[1] for link in listings[url][1]}
+        field_rows = new_rows[new_rows['Degree URL'].isin(listed_urls)]
+        if _upsert_rows(os.path.join(output_dir, file_name), field_rows, keep_urls=listed_urls):
+            stats['files_updated'] += 1
+
+    # Degrees can only be dropped from the merged file when every area was
+    # crawled and listed its degrees
+    complete = set(study_areas) >= set(all_areas) and not failures.keys() & set(study_areas)
+    all_listed = set(degrees) if complete else None
+    if _upsert_rows(all_degrees_path, new_rows, keep_urls=all_listed):
+        stats['files_updated'] += 1
+
+    print(f"Refresh: {stats['checked']} pages checked, {stats['fetched']} fetched, "
+          f"{stats['not_modified']} not modified, {stats['parsed']} newly parsed, "
+          f"{stats['files_updated']} files updated, {stats['failed']} failed")
+    report()
+    return stats
+
+
+
+def refresh_shard(shard=DEFAULT_SHARD, workers=4, pool=None):
+    # Incremental scrape of one institution/year into its own source folder,
+    # then a rebuild of just that shard's catalog. Other institutions' pages
+    # must use the same markup as adelaideuni.edu.au for these parsers to apply.
+    study_areas = shard.get('study_areas') or (STUDY_AREAS if shard['key'] == DEFAULT_SHARD['key'] else None)
+    if not study_areas:
+        raise ValueError(f"No study areas configured for shard {shard['key']}")
+    stats = refresh(study_areas, workers, shard['source_dir'], pool,
+                    cache_path=os.path.join(shard['source_dir'], PAGE_CACHE_FILE),
+                    all_degrees_file=shard['all_degrees_file'], all_areas=study_areas)
+    build_catalog(shard['source_dir'], shard['catalog_file'], shard=shard)
+    return stats
+
+
+@timed('scrape.data_pivot')
 def data_pivot(data_list):
     
     data_list = data_list.pivot_table(
@@ -106,23 +603,20 @@ def data_pivot(data_list):
 
     return data_list
 
+def parse_atar_scores(values):
+    # Trailing number of the 'Entry scores' text, e.g. '... 70' -> 70.0
+    return pd.to_numeric(values.astype(str).str.extract(ATAR_PATTERN, expand=False), errors='coerce')
+
+@timed('scrape.clean_up')
 def clean_up(data_list):
 
-    columns_to_drop = ['Check your eligibility', 'Program code', 'Indicative annual fees', 'Time commitment']
-    data_list = data_list.drop(columns=[col for col in columns_to_drop if col in data_list.columns])
+    data_list = data_list.drop(columns=[col for col in COLUMNS_TO_DROP if col in data_list.columns])
     
     if 'Entry scores' in data_list.columns:
-        data_list.rename(columns={'Entry scores': 'Guaranteed ATAR score'}, inplace=True)
-
-        def extract_number(text):
-            str_text = str(text)
-            match = re.search(r'(\d+\.?\d*)$', str_text)  # Match integers and decimals
-            return float(match.group(1)) if match else None  # Return the number or None
+        data_list = data_list.rename(columns={'Entry scores': 'Guaranteed ATAR score'})
+        data_list['Guaranteed ATAR score'] = parse_atar_scores(data_list['Guaranteed ATAR score'])
 
-        data_list['Guaranteed ATAR score'] = data_list['Guaranteed ATAR score'].apply(extract_number)
-
-    column_order = ['Degree Name', 'Guaranteed ATAR score', 'Prerequisite', 'Assumed knowledge', 'Mode', 'Campus', 'Study as', 'Duration', 'Start date', 'Degree URL']
-    existing_columns = [col for col in column_order if col in data_list.columns]
+    existing_columns = [col for col in OUTPUT_COLUMNS if col in data_list.columns]
     
     data_list = data_list[existing_columns]
 
@@ -131,20 +625,93 @@ def clean_up(data_list):
 def save_file(data_list, file_name):
     data_list.to_csv(file_name, index=False)
 
-def merge_csv(folder_path, output_file):
-    import pandas as pd
-    import glob
-    
-    csv_files = glob.glob(f"{folder_path}/*.csv")
-    dfs = [pd.read_csv(file) for file in csv_files]
-    merged_df = pd.concat(dfs, ignore_index=True, sort=False)
+MERGE_KEY = ['Degree Name', 'Degree URL']
 
-    if 'Degree Name' in merged_df.columns and 'Degree URL' in merged_df.columns:
-        before_count = len(merged_df)
-        merged_df = merged_df.drop_duplicates(subset=['Degree Name', 'Degree URL']).reset_index(drop=True)
-    
-    if 'Degree Name' in merged_df.columns:
-        merged_df = merged_df.sort_values(by='Degree Name').reset_index(drop=True)
-        
-    merged_df.to_csv(output_file, index=False)
-    return merged_df
+def validate_schema(file_name, columns):
+    problems = []
+    missing = [col for col in MERGE_KEY if col not in columns]
+    unknown = [col for col in columns if col not in OUTPUT_COLUMNS]
+    if missing:
+        problems.append(f"missing {missing}")
+    if unknown:
+        problems.append(f"unexpected {unknown}")
+    if len(set(columns)) != len(columns):
+        problems.append("duplicate column names")
+    if problems:
+        raise ValueError(f"{file_name}: " + "; ".join(problems))
+
+def _sorted_runs(paths, run_dir, chunk_rows):
+    # Split every input into sorted run files of at most chunk_rows rows.
+    # Rows carry their manifest position so the first input wins on ties.
+    runs = []
+    for order, path in enumerate(paths):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            validate_schema(path, reader.fieldnames or [])
+            while True:
+                chunk = [
+                    [row['Degree Name'].strip(), row['Degree URL'].strip(), f"{order:05d}"] + [row.get(col) or '' for col in OUTPUT_COLUMNS]
+                    for row in itertools.islice(reader, chunk_rows)
+                ]
+                if not chunk:
+                    break
+                chunk.sort(key=lambda row: row[:3])
+                run_path = os.path.join(run_dir, f"run-{len(runs):05d}.csv")
+                with open(run_path, 'w', newline='', encoding='utf-8') as run:
+                    csv.writer(run).writerows(chunk)
+                runs.append(run_path)
+    return runs
+
+@timed('scrape.merge_csv')
+def merge_csv(folder_path, output_file, manifest=None, chunk_rows=10000, force=False):
+    # Merge the per-field CSVs named in manifest (default: catalog.field_files)
+    # into output_file, one row per (Degree Name, Degree URL), sorted by name.
+    # External merge sort, so memory is bounded by chunk_rows; skipped when
+    # no input changed since the last merge recorded in <output>.merge.json.
+    if manifest is None:
+        manifest = field_files
+    paths = [os.path.join(folder_path, name) for name in manifest]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"Manifest files not found: {missing}")
+
+    state_path = f"{output_file}.merge.json"
+    inputs = {path: file_sha256(path) for path in paths}
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+    if (not force and state.get('inputs') == inputs and os.path.exists(output_file)
+            and file_sha256(output_file) == state.get('output')):
+        print(f"{output_file} is up to date ({len(paths)} inputs unchanged)")
+        return {'skipped': True, 'inputs': len(paths), 'rows': state.get('rows'), 'duplicates': 0}
+
+    rows = duplicates = 0
+    tmp_file = f"{output_file}.tmp"
+    with tempfile.TemporaryDirectory() as run_dir:
+        runs = _sorted_runs(paths, run_dir, chunk_rows)
+        run_files = [open(run, newline='', encoding='utf-8') for run in runs]
+        try:
+            merged = heapq.merge(*(csv.reader(run) for run in run_files), key=lambda row: row[:3])
+            with open(tmp_file, 'w', newline='', encoding='utf-8') as out:
+                writer = csv.writer(out)
+                writer.writerow(OUTPUT_COLUMNS)
+                last_key = None
+                for row in merged:
+                    if row[:2] == last_key:
+                        duplicates += 1
+                        continue
+                    last_key = row[:2]
+                    writer.writerow(row[3:])
+                    rows += 1
+        finally:
+            for run in run_files:
+                run.close()
+    os.replace(tmp_file, output_file)
+
+    with open(f"{state_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({'inputs': inputs, 'output': file_sha256(output_file), 'rows': rows}, f, indent=1)
+    os.replace(f"{state_path}.tmp", state_path)
+
+    print(f"Merged {len(paths)} files into {output_file}: {rows} degrees, {duplicates} duplicates dropped")
+    return {'skipped': False, 'inputs': len(paths), 'rows': rows, 'duplicates': duplicates}
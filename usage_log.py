@@ -0,0 +1,199 @@
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+
+from timing import span
+
+# Column names of the local log (same layout as filter_log.csv)
+LOG_FIELDS = [
+    "timestamp", "selected_field", "selected_degree", "selected_campus",
+    "selected_mode", "selected_start_date", "sort_column", "ascending", "num_results"
+]
+
+HEADER = [
+    "Timestamp", "Selected Field", "Selected Degree", "Selected Campus",
+    "Selected Mode", "Selected Start Date", "Sort Column", "Ascending", "Number of Results"
+]
+
+WAL_FILE = "usage_log_wal.csv"
+
+# Feedback is kept locally too, for the analytics rollup (analytics.py)
+FEEDBACK_FIELDS = ["timestamp", "rating", "feedback"]
+FEEDBACK_FILE = "feedback_log.csv"
+
+_STOP = object()
+
+
+def ensure_header(sheet):
+    # True once the sheet's first row is HEADER
+    try:
+        first_row = sheet.row_values(1)
+        if first_row != HEADER:
+            sheet.delete_rows(1)  # clear first row if different
+            sheet.insert_row(HEADER, 1)
+        return True
+    except Exception as e:
+        print(f"Error ensuring header row: {e}")
+        return False
+
+
+def append_row(path, fields, row):
+    # Appends one row (writing the header to a new file) and fsyncs it
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(fields)
+        writer.writerow(row)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def log_feedback(feedback_log: dict, path=FEEDBACK_FILE):
+    append_row(path, FEEDBACK_FIELDS, [str(feedback_log.get(field, "")) for field in FEEDBACK_FIELDS])
+
+
+class UsageLogger:
+    # Events are appended to a local write-ahead file first, then shipped to
+    # the sheet in batches by a background thread. The .offset file records
+    # how many WAL rows the sheet already has, so a restart resends the rest.
+
+    def __init__(self, sheet, wal_path=WAL_FILE, batch_size=25, flush_interval=5.0,
+                 initial_backoff=1.0, max_backoff=60.0, on_error=None):
+        # sheet is a worksheet or a zero-argument callable returning one (or
+        # None when there are no credentials); it is only called when flushing
+        self.sheet = sheet
+        self.on_error = on_error
+        self.wal_path = wal_path
+        self.offset_path = wal_path + ".offset"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self.flushed_batches = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+
+        self._queue = queue.Queue()
+        self._wal_lock = threading.Lock()
+        self._header_checked = False
+        self._backoff = 0.0
+
+        for row in self._unsent_rows():
+            self._queue.put(row)
+
+        self._thread = threading.Thread(target=self._run, name="usage-logger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close, 5.0)
+
+    def log(self, log_data: dict):
+        row = [str(log_data.get(field, "")) for field in LOG_FIELDS]
+        with self._wal_lock:
+            append_row(self.wal_path, LOG_FIELDS, row)
+            # Enqueue under the lock so queue order matches WAL order
+            self._queue.put(row)
+
+    def flush(self, timeout=None):
+        # Ask the worker to ship everything queued so far; True once it has
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout) and self._queue.empty()
+
+    def close(self, timeout=None):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path) as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_offset(self, offset):
+        tmp_path = self.offset_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(offset))
+        os.replace(tmp_path, self.offset_path)
+
+    def _unsent_rows(self):
+        if not os.path.exists(self.wal_path):
+            return []
+        with open(self.wal_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))[1:]
+        return rows[self._read_offset():]
+
+    def _run(self):
+        batch = []
+        waiters = []
+        deadline = None
+        while True:
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stopping = item is _STOP
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None and not stopping:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            # After a failed flush nothing is sent before the backoff deadline,
+            # however full the batch gets
+            due = deadline is not None and time.monotonic() >= deadline
+            ready = len(batch) >= self.batch_size or waiters
+            if batch and (due or stopping or (ready and not self._backoff)):
+                if self._flush(batch):
+                    batch = []
+                    deadline = None
+                else:
+                    deadline = time.monotonic() + self._backoff
+
+            if not batch:
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+            if stopping:
+                return
+
+    def _get_sheet(self):
+        return self.sheet() if callable(self.sheet) else self.sheet
+
+    def _flush(self, batch):
+        try:
+            sheet = self._get_sheet()
+            if sheet is None:
+                # Rows stay in the WAL and are resent by a process that has a sheet
+                self._backoff = self.max_backoff
+                return False
+            # Timed here, on the worker thread, where Sheets latency and quota stalls land
+            if not self._header_checked:
+                with span('sheets.header'):
+                    self._header_checked = ensure_header(sheet)
+            with span('sheets.append'):
+                sheet.append_rows(batch)
+        except Exception as e:
+            # Quota and transient errors: keep the batch and back off exponentially
+            self.failed_flushes += 1
+            self._backoff = min(self.max_backoff, self._backoff * 2 or self.initial_backoff)
+            print(f"Failed to log filter usage ({len(batch)} rows queued, retrying in {self._backoff:g}s): {e}")
+            if self.on_error is not None:
+                self.on_error(e)
+            return False
+
+        self._backoff = 0.0
+        self.flushed_batches += 1
+        self.flushed_rows += len(batch)
+        with self._wal_lock:
+            self._write_offset(self._read_offset() + len(batch))
+        return True
+